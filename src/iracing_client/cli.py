@@ -0,0 +1,251 @@
+"""
+Command line interface for iracing-client.
+
+    iracing-client export --cust-ids 123,456 --league-ids 3580 \\
+        --seasons 3580:93206 --parallelism 8 --output export.ndjson.gz
+
+Credentials are read from the IRACING_USERNAME and IRACING_PASSWORD environment
+variables.  Each fetched payload is written as one NDJSON line as soon as it
+arrives, and only a bounded number of requests are in flight at once, so memory
+use does not grow with the size of the export.  A fetch which fails, including
+one whose payload cannot be parsed, is written as an error line.  A throughput
+and latency summary, with percentiles estimated from a bounded sample, is printed
+to stderr at the end.
+"""
+import argparse
+import gzip
+import io
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Callable, Iterator, TextIO
+import requests
+from iracing_client import auth
+from iracing_client.data.common import FETCH_EXCEPTIONS
+from iracing_client.data.league import League
+from iracing_client.data.member import Member
+
+# Latencies kept for the percentile summary, however many records are exported.
+LATENCY_SAMPLES = 4096
+
+
+def _int_list(value: str) -> list[int]:
+    """Parse a comma-separated list of integers."""
+    return [int(item) for item in value.split(",") if item]
+
+
+def _season_list(value: str) -> list[tuple[int, int]]:
+    """Parse a comma-separated list of league_id:season_id pairs."""
+    seasons = []
+    for item in value.split(","):
+        if item:
+            league_id, _, season_id = item.partition(":")
+            seasons.append((int(league_id), int(season_id)))
+    return seasons
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for the command line."""
+    parser = argparse.ArgumentParser(prog="iracing-client")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="Export iRacing data as NDJSON.")
+    export_parser.add_argument(
+        "--cust-ids", type=_int_list, default=[], help="Members to export, e.g. 1,2"
+    )
+    export_parser.add_argument(
+        "--league-ids",
+        type=_int_list,
+        default=[],
+        help="Leagues to export with their seasons, e.g. 3580,4000",
+    )
+    export_parser.add_argument(
+        "--seasons",
+        type=_season_list,
+        default=[],
+        help="Standings and sessions to export, as league_id:season_id pairs",
+    )
+    export_parser.add_argument(
+        "--parallelism", type=int, default=4, help="Requests in flight at once."
+    )
+    export_parser.add_argument(
+        "--output", default="-", help="Output file, or - for stdout. Defaults to -."
+    )
+    export_parser.add_argument(
+        "--compress",
+        choices=["none", "gzip"],
+        default=None,
+        help="Compression. Defaults to gzip for outputs ending in .gz, else none.",
+    )
+    return parser
+
+
+def export_jobs(
+    args: argparse.Namespace, member: Member, league: League
+) -> Iterator[tuple[str, dict, Callable]]:
+    """Yield (kind, key, fetch) for each payload to export."""
+    for cust_id in args.cust_ids:
+        yield "member", {"cust_id": cust_id}, partial(member.get_member, cust_id)
+    for league_id in args.league_ids:
+        key = {"league_id": league_id}
+        yield "league", key, partial(league.get_league, league_id)
+        yield "seasons", key, partial(league.get_seasons, league_id, retired=True)
+    for league_id, season_id in args.seasons:
+        key = {"league_id": league_id, "season_id": season_id}
+        yield "standings", key, partial(
+            league.get_season_standings, league_id, season_id
+        )
+        yield "sessions", key, partial(league.get_season_sessions, league_id, season_id)
+
+
+def _timed(fetch: Callable) -> tuple[float, object, str | None]:
+    """Run fetch, returning its latency, data and error message."""
+    started = time.monotonic()
+    try:
+        data, error = fetch(), None
+    except FETCH_EXCEPTIONS as fetch_exception:
+        # A bad payload is recorded as an error line rather than ending the export.
+        data, error = None, f"{type(fetch_exception).__name__}: {fetch_exception}"
+    return time.monotonic() - started, data, error
+
+
+class ExportWriter:
+    """Writes export records as NDJSON and keeps the summary statistics."""
+
+    def __init__(self, output: TextIO):
+        self.output = output
+        self.records = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latencies = []
+        self.max_latency = 0.0
+        self.started = time.monotonic()
+
+    def write(self, kind: str, key: dict, result: tuple[float, object, str | None]):
+        """Write the result of one fetch, as returned by _timed."""
+        latency, data, error = result
+        self._sample(latency)
+        record = {"kind": kind, "key": key}
+        if error is None:
+            record["data"] = data
+            self.records += 1
+        else:
+            record["error"] = error
+            self.errors += 1
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        self.output.write(line)
+        self.bytes += len(line)
+
+    def _sample(self, latency: float):
+        """Keep a uniform sample of at most LATENCY_SAMPLES latencies."""
+        self.max_latency = max(self.max_latency, latency)
+        seen = self.records + self.errors
+        if len(self.latencies) < LATENCY_SAMPLES:
+            self.latencies.append(latency)
+        else:
+            index = random.randrange(seen + 1)
+            if index < LATENCY_SAMPLES:
+                self.latencies[index] = latency
+
+    def summary(self) -> dict:
+        """Return the summary statistics of the export so far."""
+        summary = {
+            "records": self.records,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "elapsed": time.monotonic() - self.started,
+        }
+        latencies = sorted(self.latencies)
+        for name, fraction in (("p50", 0.5), ("p95", 0.95)):
+            summary[name] = (
+                latencies[min(int(len(latencies) * fraction), len(latencies) - 1)]
+                if latencies
+                else 0.0
+            )
+        summary["max"] = self.max_latency
+        return summary
+
+
+def export(
+    args: argparse.Namespace, http_session: requests.Session, output: TextIO
+) -> dict:
+    """Fetch every requested payload and write them to output as NDJSON.
+
+    Returns:
+        dict: Summary statistics of the export.
+    """
+    jobs = export_jobs(args, Member(http_session), League(http_session))
+    writer = ExportWriter(output)
+    with ThreadPoolExecutor(max_workers=args.parallelism) as executor:
+        in_flight = {}
+        while True:
+            # Keep a bounded window of requests in flight.
+            for kind, key, fetch in jobs:
+                in_flight[executor.submit(_timed, fetch)] = (kind, key)
+                if len(in_flight) >= args.parallelism * 2:
+                    break
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                writer.write(*in_flight.pop(future), future.result())
+    return writer.summary()
+
+
+def _open_output(path: str, compress: str | None) -> TextIO:
+    """Open the export output, compressing it if requested."""
+    if compress is None:
+        compress = "gzip" if path.endswith(".gz") else "none"
+    # The caller closes the returned wrapper.  gzip.open and open return files
+    # which close the file they opened, writing out the gzip trailer first.
+    if path != "-":
+        opener = gzip.open if compress == "gzip" else open
+        return io.TextIOWrapper(opener(path, "wb"), encoding="utf-8")
+    binary = sys.stdout.buffer
+    if compress == "gzip":
+        binary = gzip.GzipFile(fileobj=binary, mode="wb")
+    return io.TextIOWrapper(binary, encoding="utf-8")
+
+
+def _print_summary(summary: dict):
+    """Print the export summary to stderr."""
+    elapsed = summary["elapsed"] or 1e-9
+    requests_made = summary["records"] + summary["errors"]
+    print(
+        f"{summary['records']} records, {summary['errors']} errors, "
+        f"{summary['bytes']} bytes in {summary['elapsed']:.2f}s "
+        f"({requests_made / elapsed:.1f} requests/s, "
+        f"{summary['bytes'] / elapsed / 1024:.1f} KiB/s); latency "
+        f"p50 {summary['p50'] * 1000:.0f}ms, p95 {summary['p95'] * 1000:.0f}ms, "
+        f"max {summary['max'] * 1000:.0f}ms",
+        file=sys.stderr,
+    )
+
+
+def main(argv: list[str] = None) -> int:
+    """Entry point for the iracing-client command."""
+    args = build_parser().parse_args(argv)
+    username = os.environ.get("IRACING_USERNAME")
+    password = os.environ.get("IRACING_PASSWORD")
+    if not username or not password:
+        print("IRACING_USERNAME and IRACING_PASSWORD must be set.", file=sys.stderr)
+        return 2
+    try:
+        http_session = auth.login(username, password)
+    except auth.AuthenticationException as authentication_exception:
+        print(authentication_exception, file=sys.stderr)
+        return 1
+    output = _open_output(args.output, args.compress)
+    try:
+        summary = export(args, http_session, output)
+    finally:
+        output.close()
+    _print_summary(summary)
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+Circuit breakers for iRacing requests.
+
+When members-ng or the host serving linked payloads degrades, every request
+would otherwise wait out the full timeout before failing.  A CircuitBreaker
+watches the outcome of recent calls and trips open when too many fail or are
+slow.  While open, calls fail fast with CircuitOpenException.  After open_seconds
+the breaker is half open and lets a few probe calls through: success closes it,
+failure opens it again.  allow() returns an admission which is passed back to
+record(), so only the outcome of a call admitted as a probe decides a half open
+breaker, and calls admitted before the breaker last tripped are ignored.
+
+CircuitBreakers keeps one breaker per key.  Data objects key calls to the data
+API by endpoint (e.g. "member/get") and every call by host, so a single failing
+endpoint does not block the others, while a failing host blocks all its calls.
+
+    breakers = CircuitBreakers(error_rate=0.5, open_seconds=30)
+    league = League(http_session, breakers=breakers)
+    if breakers.is_open("members-ng.iracing.com"):
+        postpone_work()
+"""
+import threading
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:  # pylint: disable=too-many-instance-attributes
+    """Tracks recent calls to one endpoint or host and decides if more may be made."""
+
+    def __init__(
+        self,
+        error_rate: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        slow_call_rate: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        """Initialize the breaker.
+
+        Args:
+            error_rate (float, optional): Share of failed calls in the window which trips the breaker. Defaults to 0.5.
+            slow_call_seconds (float, optional): Calls taking at least this long count as slow. Defaults to 5.
+            slow_call_rate (float, optional): Share of slow calls in the window which trips the breaker. Defaults to 0.5.
+            window (int, optional): Number of recent calls considered. Defaults to 20.
+            min_calls (int, optional): Calls needed in the window before the breaker may trip. Defaults to 10.
+            open_seconds (float, optional): Seconds the breaker stays open before probing. Defaults to 30.
+            half_open_probes (int, optional): Probe calls allowed at once while half open. Defaults to 1.
+        """  # pylint: disable=line-too-long
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._calls = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _current_state(self) -> str:
+        """Return the state, moving from open to half open once the wait is over."""
+        if self._state == OPEN and time.monotonic() >= self.retry_at:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    @property
+    def state(self) -> str:
+        """One of CLOSED, OPEN or HALF_OPEN."""
+        with self._lock:
+            return self._current_state()
+
+    @property
+    def retry_at(self) -> float:
+        """The time.monotonic() at which an open breaker becomes half open."""
+        return self._opened_at + self.open_seconds
+
+    def allow(self) -> tuple[bool, int] | None:
+        """Ask to make a call, taking a probe slot when half open.
+
+        Returns:
+            tuple[bool, int] | None: None if the call may not be made, else an admission to pass to record(): whether the call is a probe, and the breaker's generation.
+        """  # pylint: disable=line-too-long
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return (False, self._generation)
+            if state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return (True, self._generation)
+            return None
+
+    def release(self, admission: tuple[bool, int]):
+        """Return a probe slot taken by allow() for a call which was not made."""
+        with self._lock:
+            probe, generation = admission
+            if probe and generation == self._generation and self._state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    def record(
+        self, success: bool, latency: float, admission: tuple[bool, int] = None
+    ):
+        """Record the outcome of a call.
+
+        Args:
+            success (bool): True if the call succeeded.
+            latency (float): Seconds the call took.
+            admission (tuple[bool, int], optional): The call's admission from allow(). Defaults to a call which is not a probe.
+        """  # pylint: disable=line-too-long
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            state = self._current_state()
+            probe, generation = admission or (False, self._generation)
+            if generation != self._generation:
+                # A call admitted before the breaker last tripped.
+                return
+            if state == HALF_OPEN:
+                if not probe:
+                    # Only the outcome of a probe decides a half open breaker.
+                    return
+                if success and not slow:
+                    self._state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._trip()
+                return
+            if state == OPEN:
+                # A call which started before the breaker tripped.
+                return
+            self._calls.append((success, slow))
+            if len(self._calls) < self.min_calls:
+                return
+            failed = sum(1 for succeeded, _ in self._calls if not succeeded)
+            slowed = sum(1 for _, was_slow in self._calls if was_slow)
+            if (
+                failed >= len(self._calls) * self.error_rate
+                or slowed >= len(self._calls) * self.slow_call_rate
+            ):
+                self._trip()
+
+    def _trip(self):
+        """Open the breaker."""
+        self._state = OPEN
+        self._generation += 1
+        self._opened_at = time.monotonic()
+        self._probes = 0
+        self._calls.clear()
+
+
+class CircuitBreakers:
+    """A CircuitBreaker per key, all created with the same settings."""
+
+    def __init__(self, **settings):
+        """Initialize the breakers.
+
+        Args:
+            **settings: Settings for each CircuitBreaker.
+        """
+        self.settings = settings
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        """Return the breaker for a key, creating it if needed."""
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(**self.settings)
+            return self._breakers[key]
+
+    def acquire(self, keys: list) -> tuple[str | None, list]:
+        """Ask every key's breaker to allow a call.
+
+        Returns:
+            tuple[str | None, list]: The first key whose breaker is open, or None if the call may be made, and the admissions to pass to record() or release().
+        """  # pylint: disable=line-too-long
+        admissions = []
+        for key in keys:
+            admission = self.breaker(key).allow()
+            if admission is None:
+                self.release(keys, admissions)
+                return key, []
+            admissions.append(admission)
+        return None, admissions
+
+    def release(self, keys: list, admissions: list):
+        """Return the probe slots taken by acquire() for a call which was not made."""
+        for key, admission in zip(keys, admissions):
+            self.breaker(key).release(admission)
+
+    def record(self, keys: list, admissions: list, success: bool, latency: float):
+        """Record the outcome of a call allowed by acquire()."""
+        for key, admission in zip(keys, admissions):
+            self.breaker(key).record(success, latency, admission)
+
+    def is_open(self, key: str) -> bool:
+        """Return True if calls for key currently fail fast."""
+        return self.breaker(key).state == OPEN
+
+    def states(self) -> dict:
+        """Return the state of every breaker, by key."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {key: breaker.state for key, breaker in breakers.items()}
@@ -0,0 +1,206 @@
+"""
+Caches for iRacing data.
+
+SharedCache stores the raw JSON payload of each request as a file in a directory
+shared by every process on the host.  Entries are written to a temporary file and
+moved into place with os.replace(), so readers only ever see complete payloads.
+Payloads are kept as the bytes iRacing sent, so a cache hit is a plain file read
+followed by the usual json decoding - nothing is pickled.
+
+By default the cache lives in /dev/shm (shared memory) when available, in a
+directory private to the current user: it is created with mode 0700, and a
+directory someone else owns or can write to is refused, since its entries would
+be served as iRacing data.  Some endpoints answer for whichever account is
+logged in, so entries are kept apart per namespace, such as the login of the
+account the session belongs to.  Stale entries are deleted when read, and swept
+from the directory as new ones are put.
+
+MemoCache holds deserialized results in process, keyed by the parameters of a
+request, with a TTL and an LRU bound on the number of entries.
+"""
+import hashlib
+import os
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+import requests
+
+DEFAULT_TTL = 300.0
+
+DEFAULT_MAXSIZE = 128
+
+SWEEP_INTERVAL = 60.0
+
+
+def default_cache_directory() -> Path:
+    """Return the default directory for the shared cache, one per user."""
+    name = "iracing-client"
+    if hasattr(os, "getuid"):
+        name = f"{name}-{os.getuid()}"
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        return shm / name
+    return Path(tempfile.gettempdir()) / name
+
+
+def private_directory(path: Path) -> Path:
+    """Create a directory only the current user may access, or check an existing one.
+
+    Raises:
+        PermissionError: If the directory is a symlink, is owned by another user, or
+            may be written by other users.
+    """
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        return path
+    status = path.lstat()
+    if (
+        not stat.S_ISDIR(status.st_mode)
+        or status.st_uid != os.getuid()
+        or status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    ):
+        raise PermissionError(f"Refusing to use cache directory {path}: not private")
+    return path
+
+
+class SharedCache:
+    """A cross-process cache of iRacing payloads, keyed by account and request URL."""
+
+    def __init__(
+        self,
+        namespace: str,
+        directory: str | os.PathLike = None,
+        ttl: float = DEFAULT_TTL,
+    ):
+        """Initialize the cache.
+
+        Args:
+            namespace (str): Identifies the account whose data is cached, e.g. its login.
+                Only caches with the same namespace share entries.
+            directory (str | os.PathLike, optional): Directory holding the cache entries.
+                Every process which should share data must use the same directory.
+                Defaults to default_cache_directory(), which must be private to the current user.
+            ttl (float, optional): Seconds an entry stays fresh. Defaults to 300.
+        """  # pylint: disable=line-too-long
+        root = Path(directory) if directory else private_directory(
+            default_cache_directory()
+        )
+        self.directory = root / hashlib.sha256(namespace.encode("utf-8")).hexdigest()
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._swept = 0.0
+
+    def _path(self, request: requests.PreparedRequest) -> Path:
+        """Return the path of the entry for a request."""
+        key = f"{request.method} {request.url}".encode("utf-8")
+        return self.directory / hashlib.sha256(key).hexdigest()
+
+    def get(self, request: requests.PreparedRequest) -> bytes | None:
+        """Return the cached payload for a request, or None if missing or stale."""
+        path = self._path(request)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, request: requests.PreparedRequest, content: bytes):
+        """Store the payload for a request, replacing any previous entry atomically."""
+        path = self._path(request)
+        file_descriptor, temp_name = tempfile.mkstemp(prefix=".", dir=self.directory)
+        try:
+            with os.fdopen(file_descriptor, "wb") as temp_file:
+                temp_file.write(content)
+            os.replace(temp_name, path)
+        except OSError:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        if time.monotonic() - self._swept >= SWEEP_INTERVAL:
+            self._swept = time.monotonic()
+            self.sweep()
+
+    def sweep(self):
+        """Remove stale entries, and temporary files left behind by failed writes."""
+        now = time.time()
+        for path in self.directory.iterdir():
+            try:
+                if now - path.stat().st_mtime > self.ttl:
+                    # Another process may refresh the entry meanwhile; losing
+                    # that write only costs a cache miss.
+                    path.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
+
+    def invalidate(self, request: requests.PreparedRequest):
+        """Remove the entry for a request."""
+        self._path(request).unlink(missing_ok=True)
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        for path in self.directory.iterdir():
+            # Skip entries still being written by another process.
+            if not path.name.startswith("."):
+                path.unlink(missing_ok=True)
+
+
+class MemoCache:
+    """An in-process LRU cache of deserialized results with a TTL."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, maxsize: int = DEFAULT_MAXSIZE):
+        """Initialize the cache.
+
+        Args:
+            ttl (float, optional): Seconds an entry stays fresh. Defaults to 300.
+            maxsize (int, optional): Maximum number of entries; the least recently used entry is evicted first. Defaults to 128.
+        """  # pylint: disable=line-too-long
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(params: dict = None) -> tuple:
+        """Return the cache key for a params dict."""
+        return tuple(sorted((params or {}).items()))
+
+    def __len__(self) -> int:
+        """Return the number of entries, including any which have expired."""
+        return len(self._entries)
+
+    def get(self, params: dict = None):
+        """Return the cached result for params, or None if missing or stale."""
+        key = self.key(params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, result = entry
+            if time.monotonic() > expires:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def put(self, params: dict, result):
+        """Store the result for params."""
+        key = self.key(params)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, params: dict = None):
+        """Remove the entry for params."""
+        with self._lock:
+            self._entries.pop(self.key(params), None)
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._entries.clear()
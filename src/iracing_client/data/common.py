@@ -1,22 +1,148 @@
 """Base classes for iRacing data objects."""
 from abc import ABC, abstractmethod
+import os
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
 import requests
+from iracing_client.data.breaker import CircuitBreakers
+from iracing_client.data.cache import MemoCache, SharedCache
+from iracing_client.data import deadline
+from iracing_client.data.hedge import HedgePolicy
+from iracing_client.data.scheduler import INTERACTIVE, RequestScheduler
+from iracing_client.data.templates import RequestTemplates
+from iracing_client.data.transfer import ACCEPT_ENCODING, TransferStats
 
 BASE_URL = "https://members-ng.iracing.com/data/"
 
 REQUEST_TIMEOUT = 10.0
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class IRacingRequestException(Exception):
     """Raised when an iRacing request fails."""
 
 
-class IRacingDataObject(ABC):
+class CircuitOpenException(IRacingRequestException):
+    """Raised without sending a request while its circuit breaker is open."""
+
+    def __init__(self, message: str, key: str):
+        super().__init__(message)
+        self.key = key
+
+
+class DeadlineExceededException(IRacingRequestException):
+    """Raised when a request's deadline passes before it completes."""
+
+
+class RequestCancelledException(IRacingRequestException):
+    """Raised when a request's cancellation token is cancelled before it completes."""
+
+
+# Raised by a fetch which failed, or whose payload could not be decoded.
+FETCH_EXCEPTIONS = (
+    IRacingRequestException,
+    requests.RequestException,
+    ValueError,
+    KeyError,
+)
+
+
+def endpoint_of(url: str) -> str:
+    """Return the data API endpoint of a url, e.g. "member/get", or else its host."""
+    if url.startswith(BASE_URL):
+        return url[len(BASE_URL) :].split("?")[0]
+    return urlsplit(url).netloc
+
+
+def breaker_keys(url: str) -> list:
+    """Return the circuit breaker keys for a url: the data API endpoint, if any,
+    and the host."""
+    keys = [urlsplit(url).netloc]
+    if url.startswith(BASE_URL):
+        keys.insert(0, endpoint_of(url))
+    return keys
+
+
+def read_as_it_arrives(raw):
+    """Make a streamed urllib3 response yield each read of the connection.
+
+    urllib3's stream(), which iter_content uses, blocks until a whole chunk has
+    arrived, so a body trickling in would only be checked against its deadline
+    once complete.  read1() returns whatever a single read of the connection
+    brings, and each read is bounded by the request timeout.
+    """
+    if not hasattr(raw, "read1"):
+        return
+
+    def stream(amt=None, decode_content=None):
+        while True:
+            data = raw.read1(amt, decode_content=decode_content)
+            if not data:
+                return
+            yield data
+
+    raw.stream = stream
+
+
+def cached_response(
+    request: requests.PreparedRequest, content: bytes
+) -> requests.Response:
+    """Build a successful response around a cached payload."""
+    response = requests.Response()
+    response.status_code = requests.codes.ok  # pylint: disable=no-member
+    response._content = content  # pylint: disable=protected-access
+    response._content_consumed = True  # pylint: disable=protected-access
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class IRacingDataObject(ABC):  # pylint: disable=too-many-instance-attributes
     """An abstract base class for iRacing data objects."""
 
-    def __init__(self, name: str, http_session: requests.Session):
+    def __init__(
+        self,
+        name: str,
+        http_session: requests.Session,
+        cache: SharedCache = None,
+        transport=None,
+        memoize: dict[str, MemoCache] = None,
+        hedge: HedgePolicy = None,
+        scheduler: RequestScheduler = None,
+        lane: str = INTERACTIVE,
+        fast_prepare: bool = False,
+        breakers: CircuitBreakers = None,
+        transfer_stats: TransferStats = None,
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        """Initialize the data object.
+
+        Args:
+            name (str): Name used in error messages.
+            http_session (requests.Session): An authenticated iRacing session.
+            cache (SharedCache, optional): A cache shared with other processes on this host. Defaults to None.
+            transport (optional): Object whose send() executes prepared requests, such as a RecordingTransport or ReplayTransport. Defaults to http_session.
+            memoize (dict[str, MemoCache], optional): Maps method names, such as "get_league", to the cache for their results. Methods not listed are not memoized. Defaults to None.
+            hedge (HedgePolicy, optional): Hedges slow link follows with a second request. Defaults to None.
+            scheduler (RequestScheduler, optional): Shares the request budget with other data objects. Defaults to None.
+            lane (str, optional): The scheduler lane for this object's requests. Defaults to INTERACTIVE.
+            fast_prepare (bool, optional): If true, prepare requests from per-endpoint templates instead of merging the session settings each time. Defaults to False.
+            breakers (CircuitBreakers, optional): Fail fast on endpoints and hosts which are failing or slow. Defaults to None.
+            transfer_stats (TransferStats, optional): Counts the bytes received per endpoint. Defaults to None.
+        """  # pylint: disable=line-too-long
         self.name = name
         self.http_session = http_session
+        self.cache = cache
+        self.transport = transport if transport is not None else http_session
+        self.memoize = memoize or {}
+        self.hedge = hedge
+        self.scheduler = scheduler
+        self.lane = lane
+        self.templates = RequestTemplates(http_session) if fast_prepare else None
+        self.breakers = breakers
+        self.transfer_stats = transfer_stats
         self.clear_cache()
 
     @abstractmethod
@@ -27,51 +153,360 @@ class IRacingDataObject(ABC):
         """Return the iRacing session."""
         return self.http_session
 
+    def invalidate(self, method_name: str = None, params: dict = None):
+        """Remove memoized results.
+
+        Args:
+            method_name (str, optional): Method whose results are removed. Defaults to every method.
+            params (dict, optional): The params dict of the call to remove, as built by the method. Defaults to every call.
+        """  # pylint: disable=line-too-long
+        if method_name is None:
+            caches = self.memoize.values()
+        else:
+            caches = [self.memoize[method_name]] if method_name in self.memoize else []
+        for cache in caches:
+            if params is None:
+                cache.clear()
+            else:
+                cache.invalidate(params)
+
+    def invalidate_shared(self, request: requests.Request):
+        """Remove the shared cache entry for a request, if a cache is configured."""
+        if self.cache is not None:
+            self.cache.invalidate(self.prepare_request(request))
+
+    def fetch(self, method_name: str, url: str, params: dict = None):
+        """Return the data for a GET request, memoized if enabled for method_name.
+
+        Args:
+            method_name (str): Name of the calling method, used to find its cache.
+            url (str): iRacing data API url.
+            params (dict, optional): Query parameters. Defaults to None.
+
+        Returns:
+            The data, deserialized from JSON.
+        """
+        cache = self.memoize.get(method_name)
+        if cache is not None:
+            data = cache.get(params)
+            if data is not None:
+                return data
+        request = requests.Request("GET", url, params=params)
+        data = self.send(request).json()
+        if cache is not None:
+            cache.put(params, data)
+        return data
+
     def prepare_request(self, request: requests.Request) -> requests.PreparedRequest:
         """Prepare a request."""
+        if self.templates is not None:
+            prepared_request = self.templates.prepare(request)
+            if prepared_request is not None:
+                return prepared_request
         return self.http_session.prepare_request(request)
 
-    def send(self, request: requests.Request) -> requests.Response:
-        """Prepare & Execute a request using the current http session."""
+    def send(
+        self, request: requests.Request, use_cache: bool = True
+    ) -> requests.Response:
+        """Prepare & Execute a request using the current http session.
+
+        Args:
+            request (requests.Request): The iRacing data request.
+            use_cache (bool, optional): If false, fetch from iRacing even when the shared cache holds a fresh entry.  The fetched payload is still stored. Defaults to True.
+        """  # pylint: disable=line-too-long
+        prepared_request = self.prepare_request(request)
+        if self.cache is not None and use_cache:
+            content = self.cache.get(prepared_request)
+            if content is not None:
+                return cached_response(prepared_request, content)
+
+        response = self.send_data_request(prepared_request)
+        data = response.json()
+        if isinstance(data, dict) and data["link"]:
+            link_request = requests.Request("GET", data["link"])
+            response = self.follow_link(
+                link_request, endpoint=endpoint_of(prepared_request.url)
+            )
+        if self.cache is not None:
+            self.cache.put(prepared_request, response.content)
+        return response
+
+    def send_to_file(
+        self, request: requests.Request, destination: str | os.PathLike
+    ) -> Path:
+        """Prepare & Execute a request, streaming the data to a file.
+
+        The linked payload is written to disk as it arrives and is never decoded
+        or held in memory.  The shared cache is not used.
+
+        Args:
+            request (requests.Request): The iRacing data request.
+            destination (str | os.PathLike): File to write the payload to.
+
+        Returns:
+            Path: The file written, ready to be opened and memory mapped.
+        """
+        prepared_request = self.prepare_request(request)
+        response = self.send_data_request(prepared_request)
+        data = response.json()
+        if isinstance(data, dict) and data["link"]:
+            link_request = requests.Request("GET", data["link"])
+            return self.download_link(
+                link_request, destination, endpoint=endpoint_of(prepared_request.url)
+            )
+        path = Path(destination)
+        self.write_file(path, [response.content])
+        return path
+
+    def write_file(self, path: Path, chunks, scope: deadline.Deadline = None) -> int:
+        """Write chunks of a payload to a file.
+
+        The chunks are written beside path and moved into place once complete, so
+        a failed write never leaves a truncated payload behind.
+
+        Args:
+            path (Path): File to write the payload to.
+            chunks: Iterable of the payload's bytes.
+            scope (deadline.Deadline, optional): Deadline checked before each chunk. Defaults to None.
+
+        Returns:
+            int: The number of bytes written.
+        """  # pylint: disable=line-too-long
+        file_descriptor, temp_name = tempfile.mkstemp(
+            prefix=f".{path.name}.", dir=path.parent
+        )
+        written = 0
         try:
-            prepared_request = self.prepare_request(request)
-            response = self.http_session.send(prepared_request, timeout=REQUEST_TIMEOUT)
-        except requests.Timeout as timeout:
-            raise IRacingRequestException(f"{self.name} timed out") from timeout
-        except requests.ConnectionError as conection_error:
-            raise IRacingRequestException(
-                f"{self.name} failed due to connection error"
-            ) from conection_error
+            with os.fdopen(file_descriptor, "wb") as payload_file:
+                for chunk in chunks:
+                    if scope is not None:
+                        self.check_deadline(scope)
+                    payload_file.write(chunk)
+                    written += len(chunk)
+            os.replace(temp_name, path)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        return written
 
+    def send_data_request(
+        self, prepared_request: requests.PreparedRequest
+    ) -> requests.Response:
+        """Execute the request to the iRacing data API, which usually returns a link."""
+        if self.scheduler is not None:
+            scope = deadline.current()
+            if not self.scheduler.acquire(self.lane, scope):
+                self.check_deadline(scope)
+        response = self.execute(prepared_request)
+        if self.scheduler is not None:
+            self.scheduler.update(response)
         if (
             response.status_code == requests.codes.ok  # pylint: disable=no-member
             and response.cookies["authtoken_members"]
         ):
-            data = response.json()
-            if isinstance(data, dict) and data["link"]:
-                link_request = requests.Request("GET", data["link"])
-                return self.follow_link(link_request)
+            if self.transfer_stats is not None:
+                self.transfer_stats.record(
+                    endpoint_of(prepared_request.url), "data", response
+                )
             return response
 
         raise IRacingRequestException(
             f"{self.name} failed with status code {response.status_code}"
         )
 
-    def follow_link(self, link_request: requests.Request) -> requests.Response:
-        """Follow the link to the data that we requested."""
+    def check_deadline(self, scope: deadline.Deadline):
+        """Raise if no more requests may be made under scope.
+
+        Raises:
+            RequestCancelledException: If the scope has been cancelled.
+            DeadlineExceededException: If the scope's deadline has passed.
+        """
+        if scope.cancelled:
+            raise RequestCancelledException(f"{self.name} was cancelled")
+        if scope.expired:
+            raise DeadlineExceededException(f"{self.name} exceeded its deadline")
+
+    def execute(
+        self,
+        prepared_request: requests.PreparedRequest,
+        stream: bool = False,
+        scope: deadline.Deadline = None,
+    ) -> requests.Response:
+        """Execute a prepared request using the transport.
+
+        Args:
+            prepared_request (requests.PreparedRequest): The request.
+            stream (bool, optional): If true, the body is read as it is iterated. Defaults to False.
+            scope (deadline.Deadline, optional): Deadline bounding the request. Defaults to the current deadline.
+
+        Raises:
+            CircuitOpenException: If a circuit breaker for the request is open.
+            DeadlineExceededException: If the deadline passes before the response arrives.
+            RequestCancelledException: If the request is cancelled before it is sent.
+            IRacingRequestException: If the request times out or cannot connect.
+        """  # pylint: disable=line-too-long
+        if scope is None:
+            scope = deadline.current()
+        self.check_deadline(scope)
+        if self.breakers is None:
+            return self._execute(prepared_request, stream, scope)
+
+        keys = breaker_keys(prepared_request.url)
+        open_key, admissions = self.breakers.acquire(keys)
+        if open_key is not None:
+            raise CircuitOpenException(
+                f"{self.name} failed fast, circuit open for {open_key}", open_key
+            )
+        started = time.monotonic()
+        success = False
+        try:
+            response = self._execute(prepared_request, stream, scope)
+            success = (
+                response.status_code < 500
+                and response.status_code
+                != requests.codes.too_many_requests  # pylint: disable=no-member
+            )
+            return response
+        except DeadlineExceededException:
+            # The caller's budget ran out, which says nothing about the endpoint.
+            self.breakers.release(keys, admissions)
+            keys = []
+            raise
+        finally:
+            self.breakers.record(
+                keys, admissions, success, time.monotonic() - started
+            )
+
+    def _execute(
+        self,
+        prepared_request: requests.PreparedRequest,
+        stream: bool,
+        scope: deadline.Deadline,
+    ) -> requests.Response:
+        """Send a prepared request, converting requests errors."""
+        prepared_request.headers["Accept-Encoding"] = ACCEPT_ENCODING
         try:
-            prepared_request = self.prepare_request(link_request)
-            response = self.http_session.send(prepared_request, timeout=REQUEST_TIMEOUT)
+            response = self.transport.send(
+                prepared_request, timeout=scope.timeout(REQUEST_TIMEOUT), stream=stream
+            )
         except requests.Timeout as timeout:
+            if scope.expired:
+                raise DeadlineExceededException(
+                    f"{self.name} exceeded its deadline"
+                ) from timeout
             raise IRacingRequestException(f"{self.name} timed out") from timeout
         except requests.ConnectionError as conection_error:
             raise IRacingRequestException(
                 f"{self.name} failed due to connection error"
             ) from conection_error
+        if stream:
+            read_as_it_arrives(response.raw)
+        return response
 
+    def follow_link(
+        self, link_request: requests.Request, endpoint: str = None
+    ) -> requests.Response:
+        """Follow the link to the data that we requested.
+
+        Args:
+            link_request (requests.Request): Request for the linked payload.
+            endpoint (str, optional): Data API endpoint which returned the link, for transfer stats. Defaults to the link's host.
+        """  # pylint: disable=line-too-long
+        prepared_request = self.prepare_request(link_request)
+        scope = deadline.current()
+        if self.hedge is not None:
+            # Hedged attempts run on the policy's threads, outside this context.
+            response = self.hedge.send(lambda: self.fetch_link(prepared_request, scope))
+        else:
+            response = self.fetch_link(prepared_request, scope)
         if response.status_code == requests.codes.ok:  # pylint: disable=no-member
+            if self.transfer_stats is not None:
+                self.transfer_stats.record(
+                    endpoint or endpoint_of(prepared_request.url), "link", response
+                )
             return response
 
         raise IRacingRequestException(
             f"{self.name} failed with status code {response.status_code}"
         )
+
+    def fetch_link(
+        self, prepared_request: requests.PreparedRequest, scope: deadline.Deadline
+    ) -> requests.Response:
+        """Fetch a linked payload, checking the deadline as its body arrives.
+
+        A timeout only bounds each read of the connection, so without these checks
+        a body which keeps trickling in could outlast the deadline.
+
+        Raises:
+            DeadlineExceededException: If the deadline passes before the whole body arrives.
+            RequestCancelledException: If the request is cancelled before the whole body arrives.
+            IRacingRequestException: If the body cannot be read.
+        """  # pylint: disable=line-too-long
+        response = self.execute(prepared_request, stream=True, scope=scope)
+        with response:
+            chunks = []
+            try:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    self.check_deadline(scope)
+                    chunks.append(chunk)
+            except requests.RequestException as request_exception:
+                if scope.expired:
+                    raise DeadlineExceededException(
+                        f"{self.name} exceeded its deadline"
+                    ) from request_exception
+                raise IRacingRequestException(
+                    f"{self.name} failed while downloading"
+                ) from request_exception
+            self.check_deadline(scope)
+            response._content = b"".join(chunks)  # pylint: disable=protected-access
+            response._content_consumed = True  # pylint: disable=protected-access
+        return response
+
+    def download_link(
+        self,
+        link_request: requests.Request,
+        destination: str | os.PathLike,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+        endpoint: str = None,
+    ) -> Path:
+        """Follow the link to the data that we requested, streaming it to a file.
+
+        Args:
+            link_request (requests.Request): Request for the linked payload.
+            destination (str | os.PathLike): File to write the payload to.
+            chunk_size (int, optional): Bytes read from the connection at a time. Defaults to 1 MiB.
+            endpoint (str, optional): Data API endpoint which returned the link, for transfer stats. Defaults to the link's host.
+
+        Returns:
+            Path: The file written, ready to be opened and memory mapped.
+        """  # pylint: disable=line-too-long
+        prepared_request = self.prepare_request(link_request)
+        scope = deadline.current()
+        response = self.execute(prepared_request, stream=True, scope=scope)
+        with response:
+            if response.status_code != requests.codes.ok:  # pylint: disable=no-member
+                raise IRacingRequestException(
+                    f"{self.name} failed with status code {response.status_code}"
+                )
+            path = Path(destination)
+            try:
+                decoded_bytes = self.write_file(
+                    path, response.iter_content(chunk_size=chunk_size), scope
+                )
+            except requests.RequestException as request_exception:
+                if scope.expired:
+                    raise DeadlineExceededException(
+                        f"{self.name} exceeded its deadline"
+                    ) from request_exception
+                raise IRacingRequestException(
+                    f"{self.name} failed while downloading"
+                ) from request_exception
+            if self.transfer_stats is not None:
+                self.transfer_stats.record(
+                    endpoint or endpoint_of(prepared_request.url),
+                    "link",
+                    response,
+                    decoded_bytes,
+                )
+        return path
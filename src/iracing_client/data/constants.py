@@ -39,18 +39,36 @@ class Constants(IRacingDataObject):
     _divisions_request = requests.Request("GET", DIVISIONS_URL)
     _event_types_request = requests.Request("GET", EVENT_TYPES_URL)
 
-    def __init__(self, http_session: requests.Session):
+    def __init__(self, http_session: requests.Session, **options):
         """Initialize the Constants class."""
-        super().__init__("constants", http_session)
+        super().__init__("constants", http_session, **options)
         self._categories = None
         self._divisions = None
         self._event_types = None
+        self._indexes = {}
 
     def clear_cache(self):
-        """Clear the cached data."""
-        self._categories = None
-        self._divisions = None
-        self._event_types = None
+        """Clear the cached data, its indexes and its shared cache entries."""
+        for attribute, request in (
+            ("_categories", self._categories_request),
+            ("_divisions", self._divisions_request),
+            ("_event_types", self._event_types_request),
+        ):
+            if getattr(self, attribute, None) is not None:
+                self.invalidate_shared(request)
+            setattr(self, attribute, None)
+        self._indexes = {}
+
+    def _index(self, name: str, records: list) -> tuple[dict, dict]:
+        """Return the (id to record, label to id) maps for a constants list.
+        The maps are built once per fetch and cached alongside the data.
+        """
+        if name not in self._indexes:
+            self._indexes[name] = (
+                {record["value"]: record for record in records},
+                {record["label"]: record["value"] for record in records},
+            )
+        return self._indexes[name]
 
     @property
     def categories(self) -> list:
@@ -90,3 +108,57 @@ class Constants(IRacingDataObject):
         if self._event_types is None:
             self._event_types = self.send(self._event_types_request).json()
         return self._event_types
+
+    @property
+    def categories_by_id(self) -> dict:
+        """iRacing Categories keyed by category id."""
+        return self._index("categories", self.categories)[0]
+
+    @property
+    def category_ids_by_name(self) -> dict:
+        """iRacing Category ids keyed by category label, e.g. "Oval"."""
+        return self._index("categories", self.categories)[1]
+
+    @property
+    def divisions_by_id(self) -> dict:
+        """iRacing Divisions keyed by division id."""
+        return self._index("divisions", self.divisions)[0]
+
+    @property
+    def division_ids_by_name(self) -> dict:
+        """iRacing Division ids keyed by division label."""
+        return self._index("divisions", self.divisions)[1]
+
+    @property
+    def event_types_by_id(self) -> dict:
+        """iRacing Event Types keyed by event type id."""
+        return self._index("event_types", self.event_types)[0]
+
+    @property
+    def event_type_ids_by_name(self) -> dict:
+        """iRacing Event Type ids keyed by event type label."""
+        return self._index("event_types", self.event_types)[1]
+
+    def category_enum_mismatches(self) -> list:
+        """Compare the Category enum with the categories returned by iRacing.
+
+        Returns:
+            list: A description of each difference; empty if they match.
+        """
+        server = {
+            label.upper().replace(" ", "_"): category_id
+            for label, category_id in self.category_ids_by_name.items()
+        }
+        mismatches = []
+        for category in Category:
+            if category.name not in server:
+                mismatches.append(f"{category.name} is not returned by iRacing")
+            elif server[category.name] != category.value:
+                mismatches.append(
+                    f"{category.name} is {server[category.name]} on iRacing, "
+                    f"not {category.value}"
+                )
+        for name, category_id in server.items():
+            if name not in Category.__members__:
+                mismatches.append(f"{name} ({category_id}) is missing from Category")
+        return mismatches
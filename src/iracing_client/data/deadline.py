@@ -0,0 +1,156 @@
+"""
+Deadlines and cancellation for iRacing requests.
+
+A call to a data object requests the data API and then follows the link it
+returns, and each hop may take up to REQUEST_TIMEOUT.  A deadline bounds the
+whole call instead: each hop's timeout is cut to the time remaining, and once
+the deadline has passed no further request is sent.
+
+    with deadline(2.0):
+        member.get_member(cust_id)  # DeadlineExceededException after 2s
+
+A CancellationToken lets a pipeline abandon fetches it no longer needs.  Give it
+to a Deadline shared by a batch, and enter that deadline in each worker, since
+threads started by a pool do not inherit the caller's context:
+
+    token = CancellationToken()
+    batch = Deadline(seconds=30, token=token)
+
+    def fetch(cust_id):
+        with scope(batch), deadline(2.0):
+            return member.get_member(cust_id)
+
+    ...
+    token.cancel()  # Outstanding fetches raise RequestCancelledException.
+
+Deadlines nest, and an inner deadline never extends an outer one.  They are
+checked before each request is sent, while waiting on a RequestScheduler and as
+each read of a linked payload arrives, so a body which keeps trickling in is cut
+off at the deadline.  A single read from the network is bounded by the deadline
+remaining when its request was sent, and is not interrupted by cancellation.
+"""
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+CANCEL_POLL_INTERVAL = 0.05
+
+
+class CancellationToken:
+    """Signals outstanding requests to stop."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Cancel every request using this token."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True once cancel() has been called."""
+        return self._event.is_set()
+
+
+class Deadline:
+    """A point in time by which requests must finish, and the tokens which may
+    cancel them first."""
+
+    def __init__(
+        self,
+        seconds: float = None,
+        token: CancellationToken = None,
+        at: float = math.inf,
+        tokens: tuple = (),
+    ):
+        """Initialize the deadline.
+
+        Args:
+            seconds (float, optional): Seconds from now until the deadline. Defaults to no time limit.
+            token (CancellationToken, optional): Token which cancels requests under this deadline. Defaults to None.
+            at (float, optional): The time.monotonic() of the deadline, if seconds is not given. Defaults to no time limit.
+            tokens (tuple, optional): Further tokens which cancel requests under this deadline. Defaults to none.
+        """  # pylint: disable=line-too-long
+        self.at = at if seconds is None else time.monotonic() + seconds
+        self.tokens = tokens + ((token,) if token is not None else ())
+
+    def within(self, outer: "Deadline") -> "Deadline":
+        """Return a deadline which ends when either this or outer does."""
+        return Deadline(at=min(self.at, outer.at), tokens=outer.tokens + self.tokens)
+
+    def remaining(self) -> float:
+        """Return the seconds left, which are infinite without a time limit."""
+        return max(0.0, self.at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """True once the deadline has passed."""
+        return time.monotonic() >= self.at
+
+    @property
+    def cancelled(self) -> bool:
+        """True once any of the deadline's tokens has been cancelled."""
+        return any(token.cancelled for token in self.tokens)
+
+    def timeout(self, limit: float) -> float:
+        """Return limit, cut to the time remaining."""
+        return min(limit, self.remaining())
+
+    def wait_timeout(self, delay: float | None) -> float | None:
+        """Return how long a wait of delay seconds (None for no limit) may last
+        before the deadline or a cancellation must be noticed."""
+        limits = [self.remaining()]
+        if delay is not None:
+            limits.append(delay)
+        if self.tokens:
+            limits.append(CANCEL_POLL_INTERVAL)
+        wait = min(limits)
+        return None if math.isinf(wait) else wait
+
+
+NO_DEADLINE = Deadline()
+
+_current = contextvars.ContextVar("iracing_client_deadline", default=NO_DEADLINE)
+
+
+def current() -> Deadline:
+    """Return the deadline in effect, NO_DEADLINE if there is none."""
+    return _current.get()
+
+
+@contextmanager
+def scope(bound: Deadline) -> Iterator[Deadline]:
+    """Apply a deadline to every request made in the block.
+
+    Args:
+        bound (Deadline): The deadline, which may be shared with other threads.
+
+    Yields:
+        Deadline: The deadline in effect, which also honors any enclosing one.
+    """
+    effective = bound.within(_current.get())
+    reset_token = _current.set(effective)
+    try:
+        yield effective
+    finally:
+        _current.reset(reset_token)
+
+
+@contextmanager
+def deadline(
+    seconds: float = None, token: CancellationToken = None
+) -> Iterator[Deadline]:
+    """Apply a new deadline to every request made in the block.
+
+    Args:
+        seconds (float, optional): Seconds from now until the deadline. Defaults to no time limit.
+        token (CancellationToken, optional): Token which cancels the requests. Defaults to None.
+
+    Yields:
+        Deadline: The deadline in effect, which also honors any enclosing one.
+    """  # pylint: disable=line-too-long
+    with scope(Deadline(seconds, token)) as effective:
+        yield effective
@@ -0,0 +1,408 @@
+"""
+A local, searchable index of the iRacing league directory.
+
+League.get_directory answers each search with a request to iRacing, one page of
+results at a time.  A LeagueDirectoryIndex crawls the whole directory once and
+answers the same searches from memory:
+
+    index = LeagueDirectoryIndex(League(http_session))
+    index.refresh()
+    index.search(search="endurance", minimum_roster_count=20,
+                 sort=LeagueSort.ROSTERCOUNT, order=LeagueOrder.DESC)
+
+League and owner names are indexed by every substring of up to three
+characters, tags by name and recruiting or membership by flag, so a search
+touches only matching leagues.  The leagues are also kept sorted by each
+LeagueSort, so an unfiltered page, or a range of roster counts sorted by roster
+count, is a slice.  Results are ordered by the same LeagueSort and LeagueOrder
+values as get_directory.
+
+refresh() crawls the directory again but only re-indexes the leagues which were
+added, changed or removed since the previous crawl, moving each within the
+sorted orders by bisection.
+
+Filters which depend on the authenticated user's friends or watched leagues are
+not available locally; use get_directory for those.
+"""
+import bisect
+import itertools
+import math
+from typing import Iterator
+import requests
+from iracing_client.data.league import DIRECTORY_URL, League, LeagueOrder, LeagueSort
+
+DEFAULT_PAGE_SIZE = 40
+
+GRAM_LENGTH = 3
+
+FLAGS = ("is_member", "recruiting")
+
+
+def _grams(text: str) -> set:
+    """Return the substrings of lowercased text up to GRAM_LENGTH characters long."""
+    return {
+        text[i : i + length]
+        for length in range(1, GRAM_LENGTH + 1)
+        for i in range(len(text) - length + 1)
+    }
+
+
+def _tag_names(tags) -> list:
+    """Return the lowercased tag names found in a directory entry's tags."""
+    if isinstance(tags, str):
+        return [tags.lower()]
+    if isinstance(tags, list):
+        return [name for tag in tags for name in _tag_names(tag)]
+    if isinstance(tags, dict):
+        names = [tags["tag_name"].lower()] if "tag_name" in tags else []
+        for value in tags.values():
+            if isinstance(value, (list, dict)):
+                names.extend(_tag_names(value))
+        return names
+    return []
+
+
+def _owner_name(entry: dict) -> str:
+    """Return the display name of a league's owner."""
+    return (entry.get("owner") or {}).get("display_name") or ""
+
+
+class LeagueDirectoryIndex:  # pylint: disable=too-many-instance-attributes
+    """An in-memory index over the crawled league directory."""
+
+    def __init__(self, league: League, page_size: int = DEFAULT_PAGE_SIZE):
+        """Initialize an empty index.
+
+        Args:
+            league (League): League data object used to crawl the directory.
+            page_size (int, optional): Leagues requested per page while crawling. Defaults to 40.
+        """  # pylint: disable=line-too-long
+        self.league = league
+        self.page_size = page_size
+        self._entries = {}
+        self._names = {}
+        self._gram_postings = {}
+        self._tag_postings = {}
+        self._flagged = {flag: set() for flag in FLAGS}
+        self._order = {
+            LeagueSort.LEAGUENAME: [],
+            LeagueSort.DISPLAYNAME: [],
+            LeagueSort.ROSTERCOUNT: [],
+        }
+
+    def __len__(self) -> int:
+        """Return the number of leagues indexed."""
+        return len(self._entries)
+
+    def get(self, league_id: int) -> dict | None:
+        """Return the directory entry of a league, or None if it is not indexed."""
+        return self._entries.get(league_id)
+
+    def crawl(self) -> list:
+        """Fetch every page of the league directory.
+
+        Pages are requested until one comes back empty or adds no new league, and
+        each starts after the rows already received, so a server which returns
+        short pages or numbers rows from 1 is still crawled to the end.
+
+        Returns:
+            list: The directory entries, deserialized from JSON, once per league.
+        """
+        entries = {}
+        lowerbound = 0
+        while True:
+            params = {
+                "upperbound": lowerbound + self.page_size - 1,
+                "sort": LeagueSort.LEAGUENAME.value,
+                "order": LeagueOrder.ASC.value,
+            }
+            if lowerbound:
+                params = {"lowerbound": lowerbound, **params}
+            # Memoized or shared cache pages would hide changes since the last crawl.
+            request = requests.Request("GET", DIRECTORY_URL, params=params)
+            page = (
+                self.league.send(request, use_cache=False).json().get("results_page")
+                or []
+            )
+            known = len(entries)
+            for entry in page:
+                entries[entry["league_id"]] = entry
+            if len(entries) == known:
+                return list(entries.values())
+            lowerbound += len(page)
+
+    def refresh(self, entries: list = None) -> dict:
+        """Crawl the directory and re-index the leagues which changed.
+
+        Args:
+            entries (list, optional): Directory entries to index instead of crawling. They are kept by the index and must not be modified afterwards. Defaults to a fresh crawl.
+
+        Returns:
+            dict: The number of leagues "added", "changed" and "removed".
+        """  # pylint: disable=line-too-long
+        if entries is None:
+            entries = self.crawl()
+        counts = {"added": 0, "changed": 0, "removed": 0}
+        seen = set()
+        for entry in entries:
+            league_id = entry["league_id"]
+            seen.add(league_id)
+            if self._entries.get(league_id) == entry:
+                continue
+            counts["changed" if league_id in self._entries else "added"] += 1
+            self._remove(league_id)
+            self._add(entry)
+        for league_id in set(self._entries) - seen:
+            counts["removed"] += 1
+            self._remove(league_id)
+        return counts
+
+    def _sort_key(self, sort: LeagueSort, league_id: int) -> tuple:
+        """Return the key ordering a league within a sort."""
+        if sort == LeagueSort.ROSTERCOUNT:
+            return (self._entries[league_id].get("roster_count") or 0, league_id)
+        names = self._names[league_id]
+        return (names[0] if sort == LeagueSort.LEAGUENAME else names[1], league_id)
+
+    def _add(self, entry: dict):
+        """Index one directory entry."""
+        league_id = entry["league_id"]
+        self._entries[league_id] = entry
+        names = (entry.get("league_name") or "").lower(), _owner_name(entry).lower()
+        self._names[league_id] = names
+        for gram in _grams(names[0]) | _grams(names[1]):
+            self._gram_postings.setdefault(gram, set()).add(league_id)
+        for tag in _tag_names(entry.get("tags")):
+            self._tag_postings.setdefault(tag, set()).add(league_id)
+        for flag, leagues in self._flagged.items():
+            if entry.get(flag):
+                leagues.add(league_id)
+        for sort, ordered in self._order.items():
+            bisect.insort(ordered, self._sort_key(sort, league_id))
+
+    def _remove(self, league_id: int):
+        """Remove a league from the index, if present."""
+        entry = self._entries.get(league_id)
+        if entry is None:
+            return
+        for sort, ordered in self._order.items():
+            del ordered[bisect.bisect_left(ordered, self._sort_key(sort, league_id))]
+        del self._entries[league_id]
+        names = self._names.pop(league_id)
+        for gram in _grams(names[0]) | _grams(names[1]):
+            self._discard(self._gram_postings, gram, league_id)
+        for tag in _tag_names(entry.get("tags")):
+            self._discard(self._tag_postings, tag, league_id)
+        for leagues in self._flagged.values():
+            leagues.discard(league_id)
+
+    @staticmethod
+    def _discard(postings: dict, key: str, league_id: int):
+        """Remove a league from a postings set, dropping the set once empty."""
+        leagues = postings.get(key)
+        if leagues is not None:
+            leagues.discard(league_id)
+            if not leagues:
+                del postings[key]
+
+    def _matching(
+        self,
+        search: str,
+        tag: str,
+        restrict_to_member: bool,
+        restrict_to_recruiting: bool,
+    ) -> set | None:
+        """Return the ids of leagues matching the filters, or None for all.
+
+        The returned set may be one of the index's own and must not be modified.
+        """
+        candidates = None
+        if search:
+            search = search.lower()
+            if len(search) <= GRAM_LENGTH:
+                # Every substring this short is indexed, so its postings are exact.
+                candidates = self._gram_postings.get(search, set())
+            else:
+                for gram in {
+                    search[i : i + GRAM_LENGTH]
+                    for i in range(len(search) - GRAM_LENGTH + 1)
+                }:
+                    leagues = self._gram_postings.get(gram, set())
+                    candidates = leagues if candidates is None else candidates & leagues
+                    if not candidates:
+                        return set()
+                candidates = {
+                    league_id
+                    for league_id in candidates
+                    if search in self._names[league_id][0]
+                    or search in self._names[league_id][1]
+                }
+        filters = [
+            self._tag_postings.get(name.strip(), set())
+            for name in (tag.lower().split(",") if tag else ())
+        ]
+        if restrict_to_member:
+            filters.append(self._flagged["is_member"])
+        if restrict_to_recruiting:
+            filters.append(self._flagged["recruiting"])
+        for leagues in filters:
+            candidates = leagues if candidates is None else candidates & leagues
+        return candidates
+
+    def _relevance(self, search: str, league_id: int) -> tuple:
+        """Rank a league for a search: exact, prefix, then substring name matches."""
+        league_name, owner_name = self._names[league_id]
+        search = (search or "").lower()
+        if league_name == search:
+            rank = 0
+        elif league_name.startswith(search):
+            rank = 1
+        elif search in league_name:
+            rank = 2
+        else:
+            rank = 3 if owner_name.startswith(search) else 4
+        return (rank, league_name, league_id)
+
+    def _by_relevance(self, search: str, candidates: set) -> Iterator[int]:
+        """Yield the candidates in order of relevance to a lowercase search, ranking
+        them as they are walked in name order rather than sorting them all."""
+        ordered = self._order[LeagueSort.LEAGUENAME]
+        # Exact and prefix matches of the league name are a range of the name order.
+        start = bisect.bisect_left(ordered, (search,))
+        end = bisect.bisect_left(ordered, (search[:-1] + chr(ord(search[-1]) + 1),))
+        for position in range(start, end):
+            if ordered[position][1] in candidates:
+                yield ordered[position][1]
+        for rank in (2, 3, 4):
+            for _, league_id in ordered:
+                if (
+                    league_id in candidates
+                    and self._relevance(search, league_id)[0] == rank
+                ):
+                    yield league_id
+
+    def search(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        search: str = None,
+        tag: str = None,
+        restrict_to_member: bool = False,
+        restrict_to_recruiting: bool = False,
+        minimum_roster_count: int = None,
+        maximum_roster_count: int = None,
+        lowerbound: int = None,
+        upperbound: int = None,
+        sort: LeagueSort = LeagueSort.RELEVANCE,
+        order: LeagueOrder = LeagueOrder.ASC,
+    ) -> list:
+        """Search the indexed directory, as League.get_directory would.
+
+        Args:
+            search (str, optional): League or owner name search string. Defaults to None.
+            tag (str, optional): Comma-separated tags which leagues must all have. Defaults to None.
+            restrict_to_member (bool, optional): If true, return only leagues of which the authenticated user is a member. Defaults to False.
+            restrict_to_recruiting (bool, optional): If true, return only leagues which are recruiting. Defaults to False.
+            minimum_roster_count (int, optional): Minimum number of members in the league.
+            maximum_roster_count (int, optional): Maximum number of members in the league.
+            lowerbound (int, optional): First row of results to return. Defaults to 0.
+            upperbound (int, optional): Last row of results to return. Defaults to lowerbound + 39.
+            sort (LeagueSort, optional): One of relevance, leaguename, displayname, rostercount. Defaults to relevance.
+            order (LeagueOrder, optional): One of asc or desc. Defaults to asc.
+
+        Returns:
+            list: The matching directory entries.
+        """  # pylint: disable=line-too-long
+        lowerbound = lowerbound or 0
+        if upperbound is None:
+            upperbound = lowerbound + DEFAULT_PAGE_SIZE - 1
+        if not self._entries or upperbound < lowerbound:
+            return []
+        candidates = self._matching(
+            search, tag, restrict_to_member, restrict_to_recruiting
+        )
+
+        if sort == LeagueSort.RELEVANCE and not search:
+            # Without a search every league ranks by name alone.
+            sort = LeagueSort.LEAGUENAME
+        candidates, positions = self._roster_filter(
+            sort, candidates, minimum_roster_count, maximum_roster_count
+        )
+
+        if sort == LeagueSort.RELEVANCE:
+            search = search.lower()
+            if (
+                order == LeagueOrder.ASC
+                and (upperbound + 1) * len(self._entries) < len(candidates) ** 2
+            ):
+                league_ids = list(
+                    itertools.islice(
+                        self._by_relevance(search, candidates),
+                        lowerbound,
+                        upperbound + 1,
+                    )
+                )
+            else:
+                league_ids = sorted(
+                    candidates,
+                    key=lambda league_id: self._relevance(search, league_id),
+                    reverse=order == LeagueOrder.DESC,
+                )[lowerbound : upperbound + 1]
+            return [self._entries[league_id] for league_id in league_ids]
+
+        ordered = self._order[sort]
+        if order == LeagueOrder.DESC:
+            positions = positions[::-1]
+        if candidates is None:
+            league_ids = [
+                ordered[position][1]
+                for position in positions[lowerbound : upperbound + 1]
+            ]
+        elif (upperbound + 1) * len(positions) < len(candidates) ** 2:
+            # Matches are dense enough that walking the order finds the page
+            # sooner than sorting every match would.
+            league_ids = list(
+                itertools.islice(
+                    (
+                        ordered[position][1]
+                        for position in positions
+                        if ordered[position][1] in candidates
+                    ),
+                    lowerbound,
+                    upperbound + 1,
+                )
+            )
+        else:
+            league_ids = sorted(
+                candidates,
+                key=lambda league_id: self._sort_key(sort, league_id),
+                reverse=order == LeagueOrder.DESC,
+            )[lowerbound : upperbound + 1]
+        return [self._entries[league_id] for league_id in league_ids]
+
+    def _roster_filter(
+        self, sort: LeagueSort, candidates: set | None, minimum: int, maximum: int
+    ) -> tuple:
+        """Apply a roster count range to the candidates.
+
+        Returns:
+            tuple: The candidates in range, or None for all, and the range of positions in the sort order to search.
+        """  # pylint: disable=line-too-long
+        positions = range(len(self._entries))
+        if not minimum and not maximum:
+            return candidates, positions
+        roster = self._order[LeagueSort.ROSTERCOUNT]
+        start = bisect.bisect_left(roster, (minimum or 0,))
+        end = bisect.bisect_left(roster, (maximum + 1,)) if maximum else len(roster)
+        if sort == LeagueSort.ROSTERCOUNT and candidates is None:
+            # The range is a slice of the order itself.
+            return None, positions[start:end]
+        if candidates is None or len(candidates) > end - start:
+            in_range = {league_id for _, league_id in roster[start:end]}
+            return in_range if candidates is None else candidates & in_range, positions
+        minimum = minimum or 0
+        maximum = maximum or math.inf
+        in_range = {
+            league_id
+            for league_id in candidates
+            if minimum <= (self._entries[league_id].get("roster_count") or 0) <= maximum
+        }
+        return in_range, positions
@@ -0,0 +1,157 @@
+"""
+Hedged requests for iRacing link follows.
+
+The linked payloads returned by the iRacing data API are served from S3, and the
+occasional slow GET dominates tail latency.  A HedgePolicy sends a second,
+identical request when the first has not returned within a percentile of recent
+latencies, and uses whichever successful response arrives first.  The share of
+requests which may be hedged is capped so load is not doubled.
+
+A request which cannot be hedged runs on the calling thread.  One which may be
+runs on a thread of its own, so the caller can take the backup's response while
+the first attempt is still in flight; only backups use the policy's worker pool,
+so the pool size never limits how many link follows run at once.
+
+    hedge = HedgePolicy(percentile=0.95, max_ratio=0.05)
+    league = League(http_session, hedge=hedge)
+    ...
+    print(hedge.requests, hedge.fired, hedge.won)
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable
+import requests
+
+
+class HedgePolicy:  # pylint: disable=too-many-instance-attributes
+    """Decides when to hedge a request and counts how often it helped."""
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_ratio: float = 0.1,
+        window: int = 200,
+        min_samples: int = 20,
+        max_workers: int = 16,
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        """Initialize the policy.
+
+        Args:
+            percentile (float, optional): Latency percentile of recent requests after which a hedge is sent. Defaults to 0.95.
+            max_ratio (float, optional): Maximum share of requests which may be hedged. Defaults to 0.1.
+            window (int, optional): Number of recent latencies considered. Defaults to 200.
+            min_samples (int, optional): Requests are not hedged until this many latencies are known. Defaults to 20.
+            max_workers (int, optional): Threads used to run backup requests. Defaults to 16.
+        """  # pylint: disable=line-too-long
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.requests = 0
+        self.fired = 0
+        self.won = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="iracing-hedge"
+        )
+
+    def delay(self) -> float | None:
+        """Return the seconds to wait before hedging, or None if not yet known."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        index = min(int(len(latencies) * self.percentile), len(latencies) - 1)
+        return latencies[index]
+
+    def _timed(self, execute: Callable[[], requests.Response]) -> requests.Response:
+        """Run execute, recording its latency if it succeeds."""
+        started = time.monotonic()
+        response = execute()
+        with self._lock:
+            self._latencies.append(time.monotonic() - started)
+        return response
+
+    def _budget_left(self) -> bool:
+        """Return True if the hedge budget would allow another hedge now."""
+        with self._lock:
+            return self.fired + 1 <= self.requests * self.max_ratio
+
+    def _may_hedge(self) -> bool:
+        """Return True, and count the hedge, if the hedge budget allows another."""
+        with self._lock:
+            if self.fired + 1 > self.requests * self.max_ratio:
+                return False
+            self.fired += 1
+            return True
+
+    def send(self, execute: Callable[[], requests.Response]) -> requests.Response:
+        """Run execute, hedging it with a second call if it is slow.
+
+        Args:
+            execute (Callable[[], requests.Response]): Sends the request.  May be called twice, concurrently.
+
+        Returns:
+            requests.Response: The first successful response, else the first attempt's outcome.
+        """  # pylint: disable=line-too-long
+        with self._lock:
+            self.requests += 1
+        delay = self.delay()
+        if delay is None or not self._budget_left():
+            return self._timed(execute)
+
+        primary = _start_thread(lambda: self._timed(execute))
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._may_hedge():
+            return primary.result()
+
+        backup = self._executor.submit(self._timed, execute)
+        winner = None
+        pending = {primary, backup}
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done if _succeeded(future)), None)
+        if winner is None:
+            # Neither attempt succeeded; report the first attempt's outcome.
+            winner = primary
+        for loser in {primary, backup} - {winner}:
+            loser.add_done_callback(_close_response)
+        if winner is backup:
+            with self._lock:
+                self.won += 1
+        return winner.result()
+
+    def shutdown(self):
+        """Stop the worker threads once outstanding requests finish."""
+        self._executor.shutdown(wait=False)
+
+
+def _start_thread(function: Callable) -> Future:
+    """Run function on a new thread, returning a future for its result."""
+    future = Future()
+
+    def run():
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(function())
+        except BaseException as exception:  # pylint: disable=broad-exception-caught
+            future.set_exception(exception)
+
+    threading.Thread(target=run, name="iracing-hedge-primary", daemon=True).start()
+    return future
+
+
+def _succeeded(future: Future) -> bool:
+    """Return True if an attempt returned a response which was not an error."""
+    if future.exception() is not None:
+        return False
+    result = future.result()
+    return not isinstance(result, requests.Response) or result.ok
+
+
+def _close_response(future):
+    """Release the connection held by a response nobody will read."""
+    if future.exception() is None and isinstance(future.result(), requests.Response):
+        future.result().close()
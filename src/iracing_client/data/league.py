@@ -7,6 +7,7 @@ from enum import Enum
 import requests
 from iracing_client.data import common
 from iracing_client.data.common import IRacingDataObject
+from iracing_client.data.watch import SessionWatch
 
 CUST_LEAGUE_SESSIONS_URL = common.BASE_URL + "league/cust_league_sessions"
 DIRECTORY_URL = common.BASE_URL + "league/directory"
@@ -37,11 +38,12 @@ class LeagueOrder(Enum):
 class League(IRacingDataObject):
     """Functions for working with iRacing League Data."""
 
-    def __init__(self, http_session: requests.Session):
-        super().__init__("league", http_session)
+    def __init__(self, http_session: requests.Session, **options):
+        super().__init__("league", http_session, **options)
 
     def clear_cache(self):
-        """We have no cached data for this object."""
+        """Clear the memoized data.  Use invalidate() to clear selectively."""
+        self.invalidate()
 
     def get_cust_league_sessions(self, mine: bool = False, package_id: int = None):
         """League Sessions available to the authenticated user.
@@ -53,13 +55,25 @@ class League(IRacingDataObject):
         Returns:
             _type_: _description_
         """  # pylint: disable=line-too-long
-        params = {}
-        if mine:
-            params["mine"] = mine
-        if package_id:
-            params["package_id"] = package_id
+        params = _cust_league_sessions_params(mine, package_id)
+        return self.fetch("get_cust_league_sessions", CUST_LEAGUE_SESSIONS_URL, params)
+
+    def watch_cust_league_sessions(
+        self, mine: bool = False, package_id: int = None, **options
+    ) -> SessionWatch:
+        """Watch the League Sessions available to the authenticated user for changes.
+
+        Args:
+            mine (bool, optional): If true, watch only sessions created by this user. Defaults to False.
+            package_id (int, optional): If set, watch only sessions using this car or track package ID. Defaults to None.
+            **options: Polling options passed to SessionWatch.
+
+        Returns:
+            SessionWatch: A watch to subscribe to and run.
+        """  # pylint: disable=line-too-long
+        params = _cust_league_sessions_params(mine, package_id)
         request = requests.Request("GET", CUST_LEAGUE_SESSIONS_URL, params=params)
-        return self.send(request).json()
+        return SessionWatch(self, request, **options)
 
     def get_directory(
         self,
@@ -120,8 +134,7 @@ class League(IRacingDataObject):
             params["sort"] = sort.value
         if order:
             params["order"] = order.value
-        request = requests.Request("GET", DIRECTORY_URL, params=params)
-        return self.send(request).json()
+        return self.fetch("get_directory", DIRECTORY_URL, params)
 
     def get_league(self, league_id: int, include_licenses: bool = False):
         """Fetches data for a specific league.
@@ -136,8 +149,7 @@ class League(IRacingDataObject):
         params = {"league_id": league_id}
         if include_licenses:
             params["include_licenses"] = include_licenses
-        request = requests.Request("GET", LEAGUE_URL, params=params)
-        return self.send(request).json()
+        return self.fetch("get_league", LEAGUE_URL, params)
 
     def get_points_systems(self, league_id: int, season_id: int = None):
         """Return the points systems for a league.
@@ -154,8 +166,7 @@ class League(IRacingDataObject):
         params = {"league_id": league_id}
         if season_id:
             params["season_id"] = season_id
-        request = requests.Request("GET", GET_POINTS_SYSTEMS_URL, params=params)
-        return self.send(request).json()
+        return self.fetch("get_points_systems", GET_POINTS_SYSTEMS_URL, params)
 
     def get_membership(self, cust_id: int = None, include_league: bool = False):
         """Fetch iRacing League Membership for a specific customer id.
@@ -172,8 +183,7 @@ class League(IRacingDataObject):
             params["custid"] = cust_id
         if include_league:
             params["include_league"] = include_league
-        request = requests.Request("GET", MEMBERSHIP_URL, params=params)
-        return self.send(request).json()
+        return self.fetch("get_membership", MEMBERSHIP_URL, params)
 
     def get_seasons(self, league_id: int, retired: bool = False):
         """Fetch Seasons for a specific league.
@@ -188,8 +198,7 @@ class League(IRacingDataObject):
         params = {"league_id": league_id}
         if retired:
             params["retired"] = retired
-        request = requests.Request("GET", SEASONS_URL, params=params)
-        return self.send(request).json()
+        return self.fetch("get_seasons", SEASONS_URL, params)
 
     def get_season_standings(
         self,
@@ -214,8 +223,7 @@ class League(IRacingDataObject):
             params["car_class_id"] = car_class_id
         if car_id:
             params["car_id"] = car_id
-        request = requests.Request("GET", SEASON_STANDINGS_URL, params=params)
-        return self.send(request).json()
+        return self.fetch("get_season_standings", SEASON_STANDINGS_URL, params)
 
     def get_season_sessions(
         self, league_id: int, season_id: int, results_only: bool = False
@@ -230,8 +238,41 @@ class League(IRacingDataObject):
         Returns:
             _type_: _description_
         """  # pylint: disable=line-too-long
-        params = {"league_id": league_id, "season_id": season_id}
-        if results_only:
-            params["results_only"] = results_only
+        params = _season_sessions_params(league_id, season_id, results_only)
+        return self.fetch("get_season_sessions", SEASON_SESSIONS_URL, params)
+
+    def watch_season_sessions(
+        self, league_id: int, season_id: int, results_only: bool = False, **options
+    ) -> SessionWatch:
+        """Watch the Season Sessions of a specific league and season for changes.
+
+        Args:
+            league_id (int): iRacing League Id
+            season_id (int): Season Id within the league.
+            results_only (bool, optional): If true watch only sessions for which results are available. Defaults to False.
+            **options: Polling options passed to SessionWatch.
+
+        Returns:
+            SessionWatch: A watch to subscribe to and run.
+        """  # pylint: disable=line-too-long
+        params = _season_sessions_params(league_id, season_id, results_only)
         request = requests.Request("GET", SEASON_SESSIONS_URL, params=params)
-        return self.send(request).json()
+        return SessionWatch(self, request, **options)
+
+
+def _cust_league_sessions_params(mine: bool, package_id: int) -> dict:
+    """Build the params for a cust_league_sessions request."""
+    params = {}
+    if mine:
+        params["mine"] = mine
+    if package_id:
+        params["package_id"] = package_id
+    return params
+
+
+def _season_sessions_params(league_id: int, season_id: int, results_only: bool) -> dict:
+    """Build the params for a season_sessions request."""
+    params = {"league_id": league_id, "season_id": season_id}
+    if results_only:
+        params["results_only"] = results_only
+    return params
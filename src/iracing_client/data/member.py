@@ -8,6 +8,9 @@ Properties for the current authenticated user are lazily fetched and cached the
 first time a property is accessed.  To refresh the data, call the clear_cache() function
 and then access the property again.
 
+Results of the get_* functions can be memoized per function by passing memoize,
+a dict of function name to MemoCache, e.g. Member(http_session, memoize={"get_profile": MemoCache()}).
+
 Refer to https://members-ng.iracing.com/data/doc for more information.
 """ # pylint: disable=line-too-long
 import requests
@@ -26,15 +29,22 @@ PROFILE_URL = common.BASE_URL + "member/profile"
 class Member(IRacingDataObject):
     """iRacing Member Data Classes."""
 
-    def __init__(self, http_session: requests.Session):
-        super().__init__("member", http_session)
+    def __init__(self, http_session: requests.Session, **options):
+        super().__init__("member", http_session, **options)
         self._my_info = None
         self._my_participation_credits = None
 
     def clear_cache(self):
-        """Clear the cached data."""
-        self._my_info = None
-        self._my_participation_credits = None
+        """Clear the cached and memoized data, and the shared cache entries of the
+        cached properties."""
+        for attribute, url in (
+            ("_my_info", MY_INFO_URL),
+            ("_my_participation_credits", MY_PARTICIPATION_CREDITS_URL),
+        ):
+            if getattr(self, attribute, None) is not None:
+                self.invalidate_shared(requests.Request("GET", url))
+            setattr(self, attribute, None)
+        self.invalidate()
 
     def get_member(self, cust_id: int) -> dict:
         """Fetch member data for the cust_id specified.
@@ -45,8 +55,7 @@ class Member(IRacingDataObject):
         Returns:
             dict: iRacing Member Data, deserialized from JSON.
         """
-        request = requests.Request("GET", MEMBER_URL, params={"cust_ids": cust_id})
-        return self.send(request).json()
+        return self.fetch("get_member", MEMBER_URL, {"cust_ids": cust_id})
 
     def get_members(self, cust_ids: list) -> dict:
         """Fetch member data for the cust_ids specified.
@@ -64,8 +73,7 @@ class Member(IRacingDataObject):
             raise TypeError("cust_ids must contain only integers.")
         # Convert cust_ids to a comma-separated string.
         str_cust_ids = ",".join(str(cust_id) for cust_id in cust_ids)
-        request = requests.Request("GET", MEMBER_URL, params={"cust_ids": str_cust_ids})
-        return self.send(request).json()
+        return self.fetch("get_members", MEMBER_URL, {"cust_ids": str_cust_ids})
 
     def get_awards(self, cust_id: int = None) -> list:
         """iRacing Member Awards.
@@ -79,8 +87,7 @@ class Member(IRacingDataObject):
         params = {}
         if cust_id:
             params["cust_id"] = cust_id
-        request = requests.Request("GET", AWARDS_URL, params=params)
-        return self.send(request).json()
+        return self.fetch("get_awards", AWARDS_URL, params)
 
     def get_chart_data(
         self, category: Category, chart_type: ChartType, cust_id: int = None
@@ -98,8 +105,7 @@ class Member(IRacingDataObject):
         params = {"category_id": category.value, "chart_type": chart_type.value}
         if cust_id:
             params["cust_id"] = cust_id
-        request = requests.Request("GET", CHART_DATA_URL, params=params)
-        return self.send(request).json()
+        return self.fetch("get_chart_data", CHART_DATA_URL, params)
 
     @property
     def my_info(self) -> dict:
@@ -142,5 +148,4 @@ class Member(IRacingDataObject):
         params = {}
         if cust_id:
             params["cust_id"] = cust_id
-        request = requests.Request("GET", PROFILE_URL, params=params)
-        return self.send(request).json()
+        return self.fetch("get_profile", PROFILE_URL, params)
@@ -0,0 +1,138 @@
+"""
+Priority lanes for requests to the iRacing data API.
+
+Every data object sharing an authenticated session also shares its rate limit.
+A RequestScheduler meters requests out at a fixed rate and, when requests from
+several lanes are waiting, grants them in proportion to the lane weights.  A lane
+with nothing waiting gives its share to the others, so background work soaks up
+whatever capacity interactive calls leave unused.
+
+    scheduler = RequestScheduler(rate=4.0)
+    member = Member(http_session, scheduler=scheduler, lane=INTERACTIVE)
+    league = League(http_session, scheduler=scheduler, lane=BACKGROUND)
+
+The scheduler also honors the x-ratelimit-remaining and x-ratelimit-reset headers
+returned by iRacing, holding every lane when the server reports the limit spent.
+A request waits no longer than its deadline allows.
+"""
+import threading
+import time
+from collections import deque
+import requests
+from iracing_client.data.deadline import Deadline
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+DEFAULT_WEIGHTS = {INTERACTIVE: 8, BACKGROUND: 1}
+
+
+class RequestScheduler:  # pylint: disable=too-many-instance-attributes
+    """Grants requests from weighted lanes within a shared request budget."""
+
+    def __init__(
+        self, rate: float = 4.0, burst: int = 8, weights: dict[str, int] = None
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            rate (float, optional): Requests granted per second across all lanes. Defaults to 4.
+            burst (int, optional): Requests which may be granted at once after an idle period. Defaults to 8.
+            weights (dict[str, int], optional): Share of the budget for each lane while lanes compete. Defaults to 8 interactive to 1 background.
+        """  # pylint: disable=line-too-long
+        self.rate = rate
+        self.burst = burst
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.granted = dict.fromkeys(self.weights, 0)
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = {lane: deque() for lane in self.weights}
+        self._credit = dict.fromkeys(self.weights, 0)
+        self._condition = threading.Condition()
+
+    def acquire(self, lane: str, deadline: Deadline = None) -> bool:
+        """Block until a request in lane may be sent.
+
+        Args:
+            lane (str): The lane of the request.
+            deadline (Deadline, optional): Stop waiting once this passes or is cancelled. Defaults to waiting until granted.
+
+        Returns:
+            bool: True once the request is granted, False if the deadline ended the wait first.
+
+        Raises:
+            ValueError: If lane is not one of the scheduler's lanes.
+        """  # pylint: disable=line-too-long
+        if lane not in self.weights:
+            raise ValueError(f"Unknown lane {lane!r}")
+        ticket = [False]
+        with self._condition:
+            self._waiting[lane].append(ticket)
+            while True:
+                delay = self._dispatch()
+                if ticket[0]:
+                    return True
+                if deadline is not None:
+                    if deadline.expired or deadline.cancelled:
+                        self._waiting[lane] = deque(
+                            waiting
+                            for waiting in self._waiting[lane]
+                            if waiting is not ticket
+                        )
+                        return False
+                    delay = deadline.wait_timeout(delay)
+                self._condition.wait(delay)
+
+    def _dispatch(self) -> float | None:
+        """Grant waiting requests while budget remains; return seconds until more."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._refilled) * self.rate
+        )
+        self._refilled = now
+        if now < self._paused_until:
+            return self._paused_until - now
+        granted = False
+        while self._tokens >= 1:
+            lane = self._next_lane()
+            if lane is None:
+                break
+            self._waiting[lane].popleft()[0] = True
+            self.granted[lane] += 1
+            self._tokens -= 1
+            granted = True
+        if granted:
+            self._condition.notify_all()
+        return (1 - self._tokens) / self.rate if self._tokens < 1 else None
+
+    def _next_lane(self) -> str | None:
+        """Pick the lane to grant next, by smooth weighted round robin."""
+        active = [lane for lane, waiting in self._waiting.items() if waiting]
+        if not active:
+            return None
+        for lane in active:
+            self._credit[lane] += self.weights[lane]
+        chosen = max(active, key=lambda lane: self._credit[lane])
+        self._credit[chosen] -= sum(self.weights[lane] for lane in active)
+        return chosen
+
+    def update(self, response: requests.Response):
+        """Hold all lanes until the reset time if iRacing reports the limit spent."""
+        remaining = response.headers.get("x-ratelimit-remaining")
+        reset = response.headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            if int(remaining) > 0:
+                return
+            pause = float(reset) - time.time()
+        except ValueError:
+            return
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+    def waiting(self, lane: str) -> int:
+        """Return the number of requests waiting in lane."""
+        with self._condition:
+            return len(self._waiting[lane])
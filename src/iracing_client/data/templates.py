@@ -0,0 +1,162 @@
+"""
+Prepared request templates for the iRacing data API.
+
+requests.Session.prepare_request merges the session's cookies, headers, params,
+auth and hooks and parses the url on every call.  For the handful of endpoints
+used by the data objects almost all of that work is the same each time, so a
+RequestTemplate does it once per endpoint and then only encodes the params for
+each request.  The Cookie header is rebuilt only when the session's cookies
+change or one of them expires.  Linked payloads are
+fetched from urls which are already complete, so those share one template per
+host and use the url as given.
+
+Only plain requests are templated: a request carrying its own headers, cookies,
+auth, hooks or body, or a session with auth or default params set, uses the
+regular path.  Templates are rebuilt when the session's headers or hooks change.
+"""
+import math
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+import requests
+from requests.cookies import RequestsCookieJar, get_cookie_header
+
+DEFAULT_MAXSIZE = 256
+
+
+def encode_params(params: dict) -> str:
+    """Encode query parameters the way requests does for a dict of plain values."""
+    return urlencode(
+        [(key, value) for key, value in params.items() if value is not None],
+        doseq=True,
+    )
+
+
+class RequestTemplate:  # pylint: disable=too-few-public-methods
+    """The parts of a prepared request which are the same for every call."""
+
+    def __init__(self, http_session: requests.Session, method: str, url: str):
+        """Prepare the template with the regular requests path.
+
+        Args:
+            http_session (requests.Session): Session whose settings are merged.
+            method (str): HTTP method.
+            url (str): Endpoint url, without a query string.
+        """
+        self.http_session = http_session
+        template = http_session.prepare_request(requests.Request(method, url))
+        self.method = template.method
+        self.url = template.url
+        self.headers = template.headers
+        self.hooks = template.hooks
+        # The session's cookies are added per request, as they change over time.
+        self.headers.pop("Cookie", None)
+        self._cookie_cache = (None, 0.0, None)
+
+    def _cookie_header(self, prepared: requests.PreparedRequest) -> str | None:
+        """Return the Cookie header for the endpoint, rebuilt when the jar changes."""
+        jar = self.http_session.cookies
+        state = tuple(
+            (cookie.domain, cookie.path, cookie.name, cookie.value, cookie.expires)
+            for cookie in jar
+        )
+        cached_state, expires, header = self._cookie_cache
+        if state != cached_state or time.time() >= expires:
+            header = get_cookie_header(jar, prepared)
+            expires = min(
+                (cookie.expires for cookie in jar if cookie.expires), default=math.inf
+            )
+            self._cookie_cache = (state, expires, header)
+        return header
+
+    def prepare(self, params: dict = None, url: str = None) -> requests.PreparedRequest:
+        """Return a prepared request for this endpoint.
+
+        Args:
+            params (dict, optional): Query parameters, encoded as requests would. Defaults to None.
+            url (str, optional): Complete url to use instead of the template's. Defaults to None.
+        """  # pylint: disable=line-too-long
+        prepared = requests.PreparedRequest()
+        prepared.method = self.method
+        prepared.url = url or self.url
+        if params:
+            query = encode_params(params)
+            if query:
+                prepared.url = f"{prepared.url}?{query}"
+        prepared.headers = self.headers.copy()
+        prepared.hooks = self.hooks
+        prepared.body = None
+        prepared._cookies = RequestsCookieJar()  # pylint: disable=protected-access
+        if url is None:
+            cookie_header = self._cookie_header(prepared)
+        else:
+            # Cookies may depend on the path, which differs for every url.
+            cookie_header = get_cookie_header(self.http_session.cookies, prepared)
+        if cookie_header is not None:
+            prepared.headers["Cookie"] = cookie_header
+        return prepared
+
+
+class RequestTemplates:  # pylint: disable=too-few-public-methods
+    """Request templates for one session, built as endpoints are first used."""
+
+    def __init__(self, http_session: requests.Session, maxsize: int = DEFAULT_MAXSIZE):
+        """Initialize the templates.
+
+        Args:
+            http_session (requests.Session): Session the requests are sent with.
+            maxsize (int, optional): Maximum number of templates kept. Defaults to 256.
+        """
+        self.http_session = http_session
+        self.maxsize = maxsize
+        self._templates = {}
+        self._session_state = None
+        self._lock = threading.Lock()
+
+    def _template(self, method: str, url: str) -> RequestTemplate:
+        """Return the template for an endpoint, building it if needed."""
+        key = (method, url)
+        template = self._templates.get(key)
+        if template is None:
+            template = RequestTemplate(self.http_session, method, url)
+            with self._lock:
+                if len(self._templates) >= self.maxsize:
+                    self._templates.clear()
+                self._templates[key] = template
+        return template
+
+    def prepare(self, request: requests.Request) -> requests.PreparedRequest | None:
+        """Return the prepared request, or None if it cannot use a template."""
+        customized = (
+            self.http_session.auth,
+            self.http_session.params,
+            request.headers,
+            request.cookies,
+            request.auth,
+            request.data,
+            request.json,
+            request.files,
+            any(request.hooks.values()),
+        )
+        if any(customized):
+            return None
+        session_state = (
+            tuple(self.http_session.headers.items()),
+            tuple(
+                (event, tuple(hooks))
+                for event, hooks in self.http_session.hooks.items()
+            ),
+        )
+        if session_state != self._session_state:
+            # Templates hold the session's headers and hooks as they were.
+            with self._lock:
+                self._templates.clear()
+                self._session_state = session_state
+        method = request.method.upper()
+        if request.params:
+            if "?" in request.url:
+                return None
+            return self._template(method, request.url).prepare(params=request.params)
+        parts = urlsplit(request.url)
+        host_url = f"{parts.scheme}://{parts.netloc}/"
+        return self._template(method, host_url).prepare(url=request.url)
@@ -0,0 +1,96 @@
+"""
+Compressed transfer negotiation and byte accounting.
+
+requests advertises only gzip and deflate, even when urllib3 could also decode
+brotli (with the brotli package installed) or zstd (with the zstandard package
+installed).  Both are available as extras:
+
+    pip install "iracing-client[compression]"
+
+ACCEPT_ENCODING lists every encoding urllib3 can decode here, and data objects
+send it with each request.  Bodies are decoded incrementally by urllib3 as they
+are read.
+
+TransferStats counts, per endpoint and per hop, the bytes received on the wire
+and the bytes they decoded to:
+
+    stats = TransferStats()
+    league = League(http_session, transfer_stats=stats)
+    league.get_season_standings(league_id=3580, season_id=93206)
+    stats.snapshot()["league/season_standings"]["link"]
+    # {"requests": 1, "wire_bytes": 81234, "decoded_bytes": 912345, "encodings": {"gzip": 1}}
+"""  # pylint: disable=line-too-long
+import threading
+import requests
+from urllib3.util import make_headers
+
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+
+def wire_bytes(response: requests.Response, decoded_bytes: int) -> int:
+    """Return the bytes of a response body read from the wire.
+
+    Falls back to Content-Length, then to decoded_bytes, for responses which did
+    not come from a connection, such as replayed or cached responses.
+    """
+    tell = getattr(response.raw, "tell", None)
+    if tell is not None:
+        return tell()
+    content_length = response.headers.get("Content-Length")
+    if content_length is not None and content_length.isdigit():
+        return int(content_length)
+    return decoded_bytes
+
+
+class TransferStats:
+    """Counts the bytes transferred per endpoint and hop."""
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        endpoint: str,
+        hop: str,
+        response: requests.Response,
+        decoded_bytes: int = None,
+    ):
+        """Count a response whose body has been read.
+
+        Args:
+            endpoint (str): Endpoint the request was for, e.g. "member/get".
+            hop (str): "data" for the data API request, "link" for the linked payload.
+            response (requests.Response): The response.
+            decoded_bytes (int, optional): Size of the decoded body, if it was streamed rather than kept in the response. Defaults to len(response.content).
+        """  # pylint: disable=line-too-long
+        if decoded_bytes is None:
+            decoded_bytes = len(response.content)
+        wire = wire_bytes(response, decoded_bytes)
+        encoding = response.headers.get("Content-Encoding", "identity")
+        with self._lock:
+            hops = self._endpoints.setdefault(endpoint, {})
+            counts = hops.setdefault(
+                hop,
+                {"requests": 0, "wire_bytes": 0, "decoded_bytes": 0, "encodings": {}},
+            )
+            counts["requests"] += 1
+            counts["wire_bytes"] += wire
+            counts["decoded_bytes"] += decoded_bytes
+            counts["encodings"][encoding] = counts["encodings"].get(encoding, 0) + 1
+
+    def snapshot(self) -> dict:
+        """Return a copy of the counts, as {endpoint: {hop: counts}}."""
+        with self._lock:
+            return {
+                endpoint: {
+                    hop: dict(counts, encodings=dict(counts["encodings"]))
+                    for hop, counts in hops.items()
+                }
+                for endpoint, hops in self._endpoints.items()
+            }
+
+    def reset(self):
+        """Clear the counts."""
+        with self._lock:
+            self._endpoints.clear()
@@ -0,0 +1,231 @@
+"""
+Record and replay transports for iRacing data objects.
+
+A transport executes prepared requests on behalf of an IRacingDataObject.  By
+default that is the authenticated requests.Session, but a RecordingTransport can
+be used to capture every exchange (the /data hop and the linked payload) into an
+archive, and a ReplayTransport can serve them back later without a network.
+
+    recorder = RecordingTransport(http_session, "season.archive")
+    league = League(http_session, transport=recorder)
+    league.get_season_sessions(league_id=3580, season_id=93206)
+    recorder.close()
+
+    replay = ReplayTransport("season.archive")
+    league = League(requests.Session(), transport=replay)
+    league.get_season_sessions(league_id=3580, season_id=93206)
+
+Archive layout: a sequence of records, each an 8 byte header holding the length
+of a JSON metadata block and of a zlib compressed body, followed by those two
+blocks.  The index of (method, url) to record offsets is rebuilt from the
+metadata blocks when an archive is opened, so each replayed request is a single
+dictionary lookup regardless of the size of the archive.
+
+Streamed responses, such as those of send_to_file, are recorded as they are read:
+the compressed body is spooled to a temporary file rather than held in memory,
+and the record is appended once the stream is exhausted.  Cookie values, such as
+the authentication token, are not recorded; replayed cookies carry a placeholder.
+"""
+import datetime
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from collections import deque
+import requests
+from requests.cookies import cookiejar_from_dict
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, stream_decode_response_unicode
+from iracing_client.data.common import IRacingRequestException, cached_response
+
+RECORD_HEADER = struct.Struct(">II")
+
+# The stored body is already decoded, so these no longer describe it.
+_DROPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+REDACTED = "redacted"
+
+
+class ReplayMissException(IRacingRequestException):
+    """Raised when a request is replayed which was never recorded."""
+
+
+def _request_key(request: requests.PreparedRequest) -> str:
+    """Return the archive key of a prepared request."""
+    return f"{request.method} {request.url}"
+
+
+class RecordingTransport:
+    """Executes requests with an http session and records them to an archive."""
+
+    def __init__(self, http_session: requests.Session, path: str | os.PathLike):
+        """Open the archive for appending.
+
+        Args:
+            http_session (requests.Session): Session used to execute the requests.
+            path (str | os.PathLike): Archive file.  Existing records are kept.
+        """
+        self.http_session = http_session
+        self.path = path
+        self._archive = open(path, "ab")  # pylint: disable=consider-using-with
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        """Execute a request and append the exchange to the archive."""
+        started = time.perf_counter()
+        response = self.http_session.send(request, **kwargs)
+        if kwargs.get("stream"):
+            self._record_stream(request, response, started)
+            return response
+        content = response.content
+        body_block = zlib.compress(content)
+        with self._lock:
+            self._append(
+                self._metadata(request, response, time.perf_counter() - started),
+                len(body_block),
+            )
+            self._archive.write(body_block)
+        return response
+
+    def _record_stream(
+        self, request: requests.PreparedRequest, response: requests.Response, started
+    ):
+        """Record a streamed response's body as it is iterated."""
+        iter_content = response.iter_content
+
+        def recording_iter_content(chunk_size):
+            compressor = zlib.compressobj()
+            with tempfile.TemporaryFile() as spool:
+                for chunk in iter_content(chunk_size):
+                    spool.write(compressor.compress(chunk))
+                    yield chunk
+                spool.write(compressor.flush())
+                body_length = spool.tell()
+                spool.seek(0)
+                with self._lock:
+                    self._append(
+                        self._metadata(
+                            request, response, time.perf_counter() - started
+                        ),
+                        body_length,
+                    )
+                    shutil.copyfileobj(spool, self._archive)
+
+        def iter_content_wrapper(chunk_size=1, decode_unicode=False):
+            chunks = recording_iter_content(chunk_size)
+            if decode_unicode:
+                return stream_decode_response_unicode(chunks, response)
+            return chunks
+
+        response.iter_content = iter_content_wrapper
+
+    @staticmethod
+    def _metadata(
+        request: requests.PreparedRequest, response: requests.Response, elapsed: float
+    ) -> dict:
+        """Return the metadata block of an exchange."""
+        return {
+            "key": _request_key(request),
+            "status": response.status_code,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in _DROPPED_HEADERS
+            },
+            # Replay only needs to know which cookies were set.
+            "cookies": dict.fromkeys(response.cookies.keys(), REDACTED),
+            "elapsed": elapsed,
+        }
+
+    def _append(self, metadata: dict, body_length: int):
+        """Write a record's header and metadata; the caller writes the body."""
+        meta_block = json.dumps(metadata).encode("utf-8")
+        self._archive.write(RECORD_HEADER.pack(len(meta_block), body_length))
+        self._archive.write(meta_block)
+
+    def close(self):
+        """Flush and close the archive."""
+        self._archive.close()
+
+
+class ReplayTransport:
+    """Serves requests from an archive written by a RecordingTransport."""
+
+    def __init__(self, path: str | os.PathLike, realtime: bool = False):
+        """Open and index the archive.
+
+        Args:
+            path (str | os.PathLike): Archive file.
+            realtime (bool, optional): If true, each response is delayed by the time the original exchange took. Defaults to False, replaying as fast as possible.
+        """  # pylint: disable=line-too-long
+        self.path = path
+        self.realtime = realtime
+        self._lock = threading.Lock()
+        self._index = {}
+        with open(path, "rb") as archive:
+            if os.fstat(archive.fileno()).st_size:
+                self._data = mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._data = b""
+        self._build_index()
+
+    def _build_index(self):
+        """Map each request key to the offsets of its records, in recorded order."""
+        offset = 0
+        while offset < len(self._data):
+            meta_length, body_length = RECORD_HEADER.unpack_from(self._data, offset)
+            meta_start = offset + RECORD_HEADER.size
+            metadata = json.loads(self._data[meta_start : meta_start + meta_length])
+            self._index.setdefault(metadata["key"], deque()).append(
+                (metadata, meta_start + meta_length, body_length)
+            )
+            offset = meta_start + meta_length + body_length
+
+    def __len__(self) -> int:
+        """Return the number of distinct requests in the archive."""
+        return len(self._index)
+
+    def send(self, request: requests.PreparedRequest, **_options) -> requests.Response:
+        """Return the recorded response to a request.
+
+        Repeated requests are answered with their recordings in order; once those
+        are exhausted the last recording is reused.  Options such as timeout and
+        stream have no effect on a replay.
+        """
+        key = _request_key(request)
+        with self._lock:
+            records = self._index.get(key)
+            if not records:
+                raise ReplayMissException(f"{key} was not recorded")
+            record = records.popleft() if len(records) > 1 else records[0]
+        metadata, body_start, body_length = record
+        if self.realtime:
+            time.sleep(metadata["elapsed"])
+        return self._build_response(
+            request,
+            metadata,
+            zlib.decompress(self._data[body_start : body_start + body_length]),
+        )
+
+    @staticmethod
+    def _build_response(
+        request: requests.PreparedRequest, metadata: dict, content: bytes
+    ) -> requests.Response:
+        """Rebuild a response from an archive record."""
+        response = cached_response(request, content)
+        response.status_code = metadata["status"]
+        response.headers = CaseInsensitiveDict(metadata["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.cookies = cookiejar_from_dict(metadata["cookies"])
+        response.elapsed = datetime.timedelta(seconds=metadata["elapsed"])
+        return response
+
+    def close(self):
+        """Release the archive."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
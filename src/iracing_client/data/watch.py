@@ -0,0 +1,169 @@
+"""
+Watch iRacing league sessions for changes.
+
+A SessionWatch polls one sessions request with an adaptive interval: each quiet
+poll backs the interval off towards max_interval, and any change snaps it back to
+min_interval.  Each payload is hashed before it is decoded, so an unchanged
+payload costs one request and one hash.  When it has changed, only the added,
+removed and changed sessions are passed to the subscribers, so a single poller
+can serve many consumers.
+
+    watch = league.watch_season_sessions(league_id=3580, season_id=93206)
+    watch.subscribe(lambda changes: print(changes.added, changes.removed))
+    watch.run(stop_event)
+"""
+import hashlib
+import json
+import logging
+import threading
+from typing import Callable
+import requests
+from iracing_client.data.common import FETCH_EXCEPTIONS, IRacingDataObject
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(content: bytes) -> bytes:
+    """Return a digest of a payload."""
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+class SessionChanges:
+    """The sessions added, removed and changed since the previous poll."""
+
+    def __init__(self, added: list, removed: list, changed: list):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self) -> str:
+        return (
+            f"SessionChanges(added={len(self.added)}, removed={len(self.removed)}, "
+            f"changed={len(self.changed)})"
+        )
+
+
+class SessionWatch:  # pylint: disable=too-many-instance-attributes
+    """Polls a sessions request and notifies subscribers of changes."""
+
+    def __init__(
+        self,
+        data_object: IRacingDataObject,
+        request: requests.Request,
+        id_key: str = "private_session_id",
+        min_interval: float = 5.0,
+        max_interval: float = 300.0,
+        backoff: float = 2.0,
+    ):  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        """Initialize the watch.
+
+        Args:
+            data_object (IRacingDataObject): Data object used to send the request.
+            request (requests.Request): Request returning a payload with a "sessions" list.
+            id_key (str, optional): Session field identifying a session. Defaults to "private_session_id".
+            min_interval (float, optional): Seconds between polls while sessions are changing. Defaults to 5.
+            max_interval (float, optional): Longest interval between polls while quiet. Defaults to 300.
+            backoff (float, optional): Factor the interval grows by after each quiet poll. Defaults to 2.
+        """  # pylint: disable=line-too-long
+        self.data_object = data_object
+        self.request = request
+        self.id_key = id_key
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self._subscribers = []
+        self._payload_digest = None
+        self._session_digests = {}
+        self._sessions = {}
+
+    @property
+    def sessions(self) -> list:
+        """The sessions seen by the latest poll."""
+        return list(self._sessions.values())
+
+    def subscribe(self, callback: Callable[[SessionChanges], None]):
+        """Call callback with the SessionChanges of each poll which saw a change."""
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[SessionChanges], None]):
+        """Stop calling callback."""
+        self._subscribers.remove(callback)
+
+    def poll(self) -> SessionChanges:
+        """Fetch the sessions once, notify subscribers and adapt the interval.
+
+        Returns:
+            SessionChanges: Changes since the previous poll.  On the first poll every session is added.
+
+        Raises:
+            ValueError: If the payload is not a JSON object.
+        """  # pylint: disable=line-too-long
+        # A shared cache would hide changes until its entry expired.
+        content = self.data_object.send(self.request, use_cache=False).content
+        payload_digest = _digest(content)
+        if payload_digest == self._payload_digest:
+            changes = SessionChanges([], [], [])
+        else:
+            payload = json.loads(content)
+            if not isinstance(payload, dict):
+                raise ValueError(f"Expected a sessions object, got {type(payload)}")
+            changes = self._diff(payload.get("sessions") or [])
+            # Only remember payloads which decoded, so a bad one is retried.
+            self._payload_digest = payload_digest
+
+        if changes:
+            self.interval = self.min_interval
+            for callback in list(self._subscribers):
+                try:
+                    callback(changes)
+                except Exception:  # pylint: disable=broad-exception-caught
+                    # One failing consumer must not starve the others.
+                    logger.exception("Session watch subscriber %r failed", callback)
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return changes
+
+    def _diff(self, sessions: list) -> SessionChanges:
+        """Compare sessions with those of the previous poll."""
+        added, changed = [], []
+        digests, current = {}, {}
+        for session in sessions:
+            session_id = session.get(self.id_key)
+            digest = _digest(json.dumps(session, sort_keys=True).encode("utf-8"))
+            digests[session_id] = digest
+            current[session_id] = session
+            if session_id not in self._session_digests:
+                added.append(session)
+            elif self._session_digests[session_id] != digest:
+                changed.append(session)
+        removed = [
+            session
+            for session_id, session in self._sessions.items()
+            if session_id not in current
+        ]
+        self._session_digests = digests
+        self._sessions = current
+        return SessionChanges(added, removed, changed)
+
+    def run(self, stop: threading.Event):
+        """Poll until stop is set, waiting the adaptive interval between polls.
+
+        Failed polls, including payloads which cannot be decoded, are logged and
+        treated as quiet.
+        """
+        while not stop.is_set():
+            try:
+                self.poll()
+            except FETCH_EXCEPTIONS as poll_exception:
+                logger.warning(
+                    "Session watch poll failed: %s: %s",
+                    type(poll_exception).__name__,
+                    poll_exception,
+                )
+                self.interval = min(self.interval * self.backoff, self.max_interval)
+            stop.wait(self.interval)
@@ -0,0 +1,53 @@
+"""Compare preparing requests with RequestTemplates against Session.prepare_request.
+
+Run from the project root:
+    poetry run python test_scripts/benchmark_request_templates.py
+"""
+import sys
+import timeit
+import requests
+from requests.cookies import create_cookie
+
+sys.path.insert(0, "src")
+
+# pylint: disable=wrong-import-position
+from iracing_client.data.league import SEASON_STANDINGS_URL
+from iracing_client.data.templates import RequestTemplates
+
+CALLS = 100_000
+
+http_session = requests.Session()
+http_session.cookies.set_cookie(
+    create_cookie("authtoken_members", "token", domain=".iracing.com")
+)
+templates = RequestTemplates(http_session)
+
+
+def build_request(call: int) -> requests.Request:
+    """Build a request like League.get_season_standings does."""
+    params = {"league_id": 3580, "season_id": 93206, "car_class_id": call}
+    return requests.Request("GET", SEASON_STANDINGS_URL, params=params)
+
+
+def prepare_with_session():
+    """Prepare requests the regular way."""
+    for call in range(CALLS):
+        http_session.prepare_request(build_request(call))
+
+
+def prepare_with_templates():
+    """Prepare requests from templates."""
+    for call in range(CALLS):
+        templates.prepare(build_request(call))
+
+
+if __name__ == "__main__":
+    assert (
+        templates.prepare(build_request(1)).url
+        == http_session.prepare_request(build_request(1)).url
+    )
+    session_seconds = timeit.timeit(prepare_with_session, number=1)
+    template_seconds = timeit.timeit(prepare_with_templates, number=1)
+    print(f"Session.prepare_request: {session_seconds:.2f}s for {CALLS} calls")
+    print(f"RequestTemplates:        {template_seconds:.2f}s for {CALLS} calls")
+    print(f"Speedup:                 {session_seconds / template_seconds:.1f}x")
@@ -1,7 +1,70 @@
 """Pytest configuration for unit tests."""
+import json
 import pytest
+import requests
+from requests.cookies import cookiejar_from_dict
+
+LINK_HOST = "https://s3.example.com/"
+
+
+def make_response(
+    request: requests.PreparedRequest, status_code: int, body, cookies: dict = None
+) -> requests.Response:
+    """Build a canned response for a prepared request."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode("utf-8")
+    response._content_consumed = True
+    response.url = request.url
+    response.request = request
+    response.cookies = cookiejar_from_dict(cookies or {})
+    return response
+
+
+class FakeSession(requests.Session):
+    """A requests.Session which answers from canned payloads instead of iRacing.
+
+    Payloads are registered per URL (without query string).  A request to the
+    iRacing data API returns a link to the payload, mimicking the real two hop flow.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.payloads = {}
+        self.sent = []
+
+    def add(self, url: str, payload, status_code: int = 200):
+        """Register the payload returned for a data API url.
+
+        The payload may be a callable, which is given the full data API url.
+        """
+        self.payloads[url] = (status_code, payload)
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        self.sent.append(request.url)
+        if request.url.startswith(LINK_HOST):
+            data_url = request.url[len(LINK_HOST) :]
+            status_code, payload = self.payloads[data_url.split("?")[0]]
+            if callable(payload):
+                payload = payload(data_url)
+            return make_response(request, status_code, payload)
+        if request.url.split("?")[0] not in self.payloads:
+            return make_response(request, 404, {"error": "not found"})
+        return make_response(
+            request,
+            200,
+            {"link": LINK_HOST + request.url},
+            cookies={"authtoken_members": "token"},
+        )
+
 
 @pytest.fixture(scope="session")
 def dummy():
     """Return a dummy value."""
     return "dummy"
+
+
+@pytest.fixture
+def fake_session():
+    """Return a FakeSession with no payloads registered."""
+    return FakeSession()
@@ -0,0 +1,85 @@
+"""Test breaker module."""
+import pytest
+import requests
+from iracing_client.data.breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakers,
+)
+from iracing_client.data.common import CircuitOpenException, IRacingRequestException
+from iracing_client.data.league import League
+
+
+class FailingTransport:  # pylint: disable=too-few-public-methods
+    """A transport whose requests never connect."""
+
+    def __init__(self):
+        self.sent = 0
+
+    def send(self, request, **kwargs):  # pylint: disable=unused-argument
+        """Fail to send the request."""
+        self.sent += 1
+        raise requests.ConnectionError("unreachable")
+
+
+def test_breaker_trips_on_error_rate():
+    """Test the breaker opens once enough calls fail."""
+    breaker = CircuitBreaker(error_rate=0.5, min_calls=4)
+    for success in (True, False, True):
+        assert breaker.allow()
+        breaker.record(success, 0.1)
+    assert breaker.state == CLOSED
+    breaker.record(False, 0.1)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_breaker_trips_on_latency():
+    """Test the breaker opens once enough calls are slow."""
+    breaker = CircuitBreaker(slow_call_seconds=1, slow_call_rate=0.5, min_calls=2)
+    breaker.record(True, 2.0)
+    breaker.record(True, 3.0)
+    assert breaker.state == OPEN
+
+
+def test_half_open_probe():
+    """Test a half open breaker allows one probe, which closes it on success."""
+    breaker = CircuitBreaker(min_calls=1, open_seconds=0)
+    breaker.record(False, 0.1)
+    assert breaker.state == HALF_OPEN
+    probe = breaker.allow()
+    assert probe
+    assert not breaker.allow()
+    breaker.record(True, 0.1, probe)
+    assert breaker.state == CLOSED
+
+
+def test_late_call_is_not_a_probe():
+    """Test a call admitted before the breaker tripped cannot close it."""
+    breaker = CircuitBreaker(min_calls=1, open_seconds=0)
+    late = breaker.allow()
+    breaker.record(False, 0.1, breaker.allow())
+    assert breaker.state == HALF_OPEN
+    breaker.record(True, 0.1, late)
+    assert breaker.state == HALF_OPEN
+    probe = breaker.allow()
+    breaker.record(True, 0.1, probe)
+    assert breaker.state == CLOSED
+
+
+def test_data_object_fails_fast():
+    """Test requests fail fast without being sent once the host's breaker opens."""
+    transport = FailingTransport()
+    breakers = CircuitBreakers(min_calls=2, open_seconds=60)
+    league = League(requests.Session(), transport=transport, breakers=breakers)
+    for _ in range(2):
+        with pytest.raises(IRacingRequestException):
+            league.get_league(league_id=1)
+    with pytest.raises(CircuitOpenException) as circuit_open:
+        league.get_league(league_id=1)
+    assert circuit_open.value.key == "league/get"
+    assert transport.sent == 2
+    assert breakers.is_open("members-ng.iracing.com")
+    assert breakers.states() == {"league/get": OPEN, "members-ng.iracing.com": OPEN}
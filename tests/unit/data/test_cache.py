@@ -0,0 +1,104 @@
+"""Test cache module."""
+import os
+import time
+import stat
+import pytest
+import requests
+from iracing_client.data import cache as cache_module
+from iracing_client.data.cache import SharedCache
+from iracing_client.data.constants import Constants, CATEGORIES_URL
+from iracing_client.data.member import Member, MY_INFO_URL
+
+NAMESPACE = "driver@example.com"
+
+
+def test_shared_cache_round_trip(tmp_path):
+    """Test a payload stored by one cache is visible to another."""
+    request = requests.Request("GET", CATEGORIES_URL).prepare()
+    writer = SharedCache(NAMESPACE, tmp_path)
+    reader = SharedCache(NAMESPACE, tmp_path)
+    assert reader.get(request) is None
+    writer.put(request, b"[1, 2]")
+    assert reader.get(request) == b"[1, 2]"
+    reader.invalidate(request)
+    assert writer.get(request) is None
+
+
+def test_shared_cache_expires(tmp_path):
+    """Test stale entries are ignored."""
+    request = requests.Request("GET", CATEGORIES_URL).prepare()
+    cache = SharedCache(NAMESPACE, tmp_path, ttl=60)
+    cache.put(request, b"[]")
+    stale = time.time() - 120
+    for path in cache.directory.iterdir():
+        os.utime(path, (stale, stale))
+    assert cache.get(request) is None
+    assert not list(cache.directory.iterdir())
+
+
+def test_shared_cache_sweeps_stale_entries(tmp_path):
+    """Test putting an entry removes other stale entries."""
+    SharedCache(NAMESPACE, tmp_path).put(
+        requests.Request("GET", CATEGORIES_URL).prepare(), b"[]"
+    )
+    cache = SharedCache(NAMESPACE, tmp_path, ttl=60)
+    stale = time.time() - 120
+    for path in cache.directory.iterdir():
+        os.utime(path, (stale, stale))
+    cache.put(requests.Request("GET", MY_INFO_URL).prepare(), b"{}")
+    assert len(list(cache.directory.iterdir())) == 1
+
+
+def test_default_directory_is_private(monkeypatch, tmp_path):
+    """Test the default directory is created for the current user alone."""
+    assert cache_module.default_cache_directory().name.endswith(f"-{os.getuid()}")
+    monkeypatch.setattr(
+        cache_module, "default_cache_directory", lambda: tmp_path / "shared"
+    )
+    cache = SharedCache(NAMESPACE)
+    assert stat.S_IMODE((tmp_path / "shared").stat().st_mode) == 0o700
+    assert stat.S_IMODE(cache.directory.stat().st_mode) == 0o700
+
+
+def test_default_directory_must_be_private(monkeypatch, tmp_path):
+    """Test a default directory other users can write to is refused."""
+    planted = tmp_path / "shared"
+    planted.mkdir()
+    planted.chmod(0o777)
+    monkeypatch.setattr(cache_module, "default_cache_directory", lambda: planted)
+    with pytest.raises(PermissionError):
+        SharedCache(NAMESPACE)
+
+
+def test_shared_cache_namespaces(fake_session, tmp_path):
+    """Test accounts do not see each other's entries."""
+    fake_session.add(MY_INFO_URL, {"cust_id": 1})
+    member = Member(fake_session, cache=SharedCache(NAMESPACE, tmp_path))
+    assert member.my_info == {"cust_id": 1}
+    other = Member(fake_session, cache=SharedCache("other@example.com", tmp_path))
+    sent = len(fake_session.sent)
+    assert other.my_info == {"cust_id": 1}
+    assert len(fake_session.sent) > sent
+
+
+def test_clear_cache_invalidates_shared_entries(fake_session, tmp_path):
+    """Test clear_cache() refreshes from iRacing rather than the shared cache."""
+    info = {"cust_id": 1}
+    fake_session.add(MY_INFO_URL, lambda url: info)
+    member = Member(fake_session, cache=SharedCache(NAMESPACE, tmp_path))
+    assert member.my_info == {"cust_id": 1}
+    info = {"cust_id": 2}
+    member.clear_cache()
+    assert member.my_info == {"cust_id": 2}
+
+
+def test_shared_cache_warms_other_objects(fake_session, tmp_path):
+    """Test one data object's fetch is served to another from the cache."""
+    fake_session.add(CATEGORIES_URL, [{"label": "Oval", "value": 1}])
+    cache = SharedCache(NAMESPACE, tmp_path)
+    first = Constants(fake_session, cache=cache)
+    second = Constants(fake_session, cache=cache)
+    assert first.categories == [{"label": "Oval", "value": 1}]
+    sent = len(fake_session.sent)
+    assert second.categories == [{"label": "Oval", "value": 1}]
+    assert len(fake_session.sent) == sent
@@ -0,0 +1,96 @@
+"""Test common module."""
+import json
+import mmap
+import os
+import pytest
+import requests
+from iracing_client.data.common import (
+    IRacingRequestException,
+    RequestCancelledException,
+)
+from iracing_client.data.deadline import CancellationToken, deadline
+from iracing_client.data.league import League, SEASON_SESSIONS_URL
+from tests.unit.conftest import LINK_HOST, make_response
+
+
+def test_send_to_file(fake_session, tmp_path):
+    """Test the linked payload is streamed to a file."""
+    sessions = {"success": True, "sessions": [{"session_id": 1}]}
+    fake_session.add(SEASON_SESSIONS_URL, sessions)
+    league = League(fake_session)
+    request = requests.Request("GET", SEASON_SESSIONS_URL, params={"season_id": 1})
+    path = league.send_to_file(request, tmp_path / "sessions.json")
+    with open(path, "rb") as payload_file:
+        with mmap.mmap(payload_file.fileno(), 0, access=mmap.ACCESS_READ) as payload:
+            assert json.loads(payload[:]) == sessions
+
+
+def test_download_link_failure(fake_session, tmp_path):
+    """Test a failed link download raises."""
+    fake_session.add(SEASON_SESSIONS_URL, {}, status_code=403)
+    league = League(fake_session)
+    request = requests.Request("GET", SEASON_SESSIONS_URL)
+    with pytest.raises(IRacingRequestException):
+        league.send_to_file(request, tmp_path / "sessions.json")
+
+
+class CancellingTransport:  # pylint: disable=too-few-public-methods
+    """A transport which cancels a token once the first chunk has been read."""
+
+    def __init__(self, http_session, token):
+        self.http_session = http_session
+        self.token = token
+
+    def send(self, request, **options):
+        """Send the request, cancelling the token after its first chunk."""
+        response = self.http_session.send(request, **options)
+        chunks = response.iter_content
+
+        def cancelling(chunk_size=1, decode_unicode=False):
+            for chunk in chunks(chunk_size, decode_unicode):
+                yield chunk
+                self.token.cancel()
+
+        response.iter_content = cancelling
+        return response
+
+
+def test_interrupted_download_leaves_no_file(fake_session, tmp_path):
+    """Test a download cancelled part way does not leave a truncated file."""
+    fake_session.add(SEASON_SESSIONS_URL, {"sessions": [{"session_id": 1}] * 100})
+    token = CancellationToken()
+    league = League(fake_session, transport=CancellingTransport(fake_session, token))
+    link_request = requests.Request("GET", LINK_HOST + SEASON_SESSIONS_URL)
+    with deadline(token=token), pytest.raises(RequestCancelledException):
+        league.download_link(link_request, tmp_path / "sessions.json", chunk_size=100)
+    assert not list(tmp_path.iterdir())
+
+
+class LinklessTransport:  # pylint: disable=too-few-public-methods
+    """A transport whose data API answers with the payload instead of a link."""
+
+    def send(self, request, **_options):
+        """Answer with an inline payload."""
+        return make_response(
+            request,
+            200,
+            {"link": None, "sessions": []},
+            cookies={"authtoken_members": "token"},
+        )
+
+
+def test_failed_inline_write_keeps_destination(fake_session, monkeypatch, tmp_path):
+    """Test an inline payload which fails to be written leaves the old file intact."""
+    destination = tmp_path / "sessions.json"
+    destination.write_bytes(b"previous")
+    league = League(fake_session, transport=LinklessTransport())
+
+    def failing_replace(source, target):
+        raise OSError(f"cannot replace {target} with {source}")
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    request = requests.Request("GET", SEASON_SESSIONS_URL)
+    with pytest.raises(OSError):
+        league.send_to_file(request, destination)
+    assert destination.read_bytes() == b"previous"
+    assert list(tmp_path.iterdir()) == [destination]
@@ -0,0 +1,45 @@
+"""Test constants module."""
+from iracing_client.data.constants import Constants, CATEGORIES_URL, EVENT_TYPES_URL
+
+CATEGORIES = [
+    {"label": "Oval", "value": 1},
+    {"label": "Road", "value": 2},
+    {"label": "Dirt Oval", "value": 3},
+    {"label": "Dirt Road", "value": 4},
+]
+
+
+def test_indexes_built_once(fake_session):
+    """Test lookups are served from indexes built once per fetch."""
+    fake_session.add(CATEGORIES_URL, CATEGORIES)
+    fake_session.add(EVENT_TYPES_URL, [{"label": "Race", "value": 5}])
+    constants = Constants(fake_session)
+    assert constants.categories_by_id[3] == {"label": "Dirt Oval", "value": 3}
+    assert constants.category_ids_by_name["Road"] == 2
+    assert constants.categories_by_id is constants.categories_by_id
+    assert constants.event_type_ids_by_name == {"Race": 5}
+    assert len(fake_session.sent) == 4
+
+    constants.clear_cache()
+    assert constants.category_ids_by_name["Oval"] == 1
+    assert len(fake_session.sent) == 6
+
+
+def test_category_enum_matches(fake_session):
+    """Test the Category enum matches the categories returned by iRacing."""
+    fake_session.add(CATEGORIES_URL, CATEGORIES)
+    assert not Constants(fake_session).category_enum_mismatches()
+
+
+def test_category_enum_mismatches(fake_session):
+    """Test differences from the Category enum are reported."""
+    fake_session.add(
+        CATEGORIES_URL,
+        CATEGORIES[1:]
+        + [{"label": "Oval", "value": 9}, {"label": "Formula Car", "value": 6}],
+    )
+    mismatches = Constants(fake_session).category_enum_mismatches()
+    assert mismatches == [
+        "OVAL is 9 on iRacing, not 1",
+        "FORMULA_CAR (6) is missing from Category",
+    ]
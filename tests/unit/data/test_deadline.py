@@ -0,0 +1,147 @@
+"""Test deadline module."""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from iracing_client.data.breaker import CircuitBreakers
+from iracing_client.data.common import (
+    DeadlineExceededException,
+    RequestCancelledException,
+)
+from iracing_client.data.deadline import CancellationToken, Deadline, deadline, scope
+from iracing_client.data.league import League
+from iracing_client.data.member import Member, MEMBER_URL
+from iracing_client.data.scheduler import INTERACTIVE, RequestScheduler
+
+
+class TimeoutRecorder:  # pylint: disable=too-few-public-methods
+    """A transport which records the timeout of each request it sends."""
+
+    def __init__(self, http_session):
+        self.http_session = http_session
+        self.timeouts = []
+
+    def send(self, request, **options):
+        """Send the request with the session, recording its timeout."""
+        self.timeouts.append(options["timeout"])
+        return self.http_session.send(request, **options)
+
+
+def test_deadline_bounds_both_hops(fake_session):
+    """Test each hop's timeout is cut to the time remaining."""
+    fake_session.add(MEMBER_URL, {"members": []})
+    transport = TimeoutRecorder(fake_session)
+    member = Member(fake_session, transport=transport)
+    member.get_member(1)
+    assert transport.timeouts == [10.0, 10.0]
+
+    with deadline(2.0):
+        member.get_member(1)
+    assert all(timeout <= 2.0 for timeout in transport.timeouts[2:])
+
+
+def test_expired_deadline_sends_nothing(fake_session):
+    """Test no request is sent once the deadline has passed."""
+    fake_session.add(MEMBER_URL, {"members": []})
+    breakers = CircuitBreakers(min_calls=1)
+    member = Member(fake_session, breakers=breakers)
+    with deadline(10.0), deadline(0.0), pytest.raises(DeadlineExceededException):
+        member.get_member(1)
+    assert not fake_session.sent
+    assert not breakers.states()
+
+
+def test_cancellation_token(fake_session):
+    """Test a cancelled batch abandons its outstanding fetches."""
+    fake_session.add(MEMBER_URL, {"members": []})
+    token = CancellationToken()
+    batch = Deadline(seconds=30, token=token)
+    member = Member(fake_session)
+    with scope(batch):
+        member.get_member(1)
+        token.cancel()
+        with pytest.raises(RequestCancelledException):
+            member.get_member(2)
+    assert len(fake_session.sent) == 2
+
+
+def test_scheduler_wait_ends_at_deadline(fake_session):
+    """Test a request stops waiting for the scheduler when its deadline passes."""
+    fake_session.add(MEMBER_URL, {"members": []})
+    scheduler = RequestScheduler(rate=0.1, burst=1)
+    member = Member(fake_session, scheduler=scheduler)
+    member.get_member(1)
+    started = time.monotonic()
+    with deadline(0.1), pytest.raises(DeadlineExceededException):
+        member.get_member(2)
+    assert time.monotonic() - started < 1
+    assert scheduler.waiting(INTERACTIVE) == 0
+
+
+def test_scheduler_wait_ends_on_cancel():
+    """Test cancelling a token wakes a request waiting for the scheduler."""
+    scheduler = RequestScheduler(rate=0.1, burst=1)
+    scheduler.acquire(INTERACTIVE)
+    token = CancellationToken()
+    results = []
+    waiter = threading.Thread(
+        target=lambda: results.append(
+            scheduler.acquire(INTERACTIVE, Deadline(token=token))
+        )
+    )
+    waiter.start()
+    time.sleep(0.05)
+    token.cancel()
+    waiter.join(timeout=1)
+    assert results == [False]
+
+
+class TrickleHandler(BaseHTTPRequestHandler):
+    """Serves a JSON body one byte every 50ms."""
+
+    body = b'{"sessions": []' + b" " * 10 + b"}"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Send the body slowly."""
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        try:
+            for byte in self.body:
+                self.wfile.write(bytes([byte]))
+                self.wfile.flush()
+                time.sleep(0.05)
+        except OSError:
+            pass  # The client gave up.
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keep the test output quiet."""
+
+
+@pytest.fixture
+def trickle_server():
+    """Return the url of a local server which trickles its response body."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TrickleHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/link"
+    server.shutdown()
+    server.server_close()
+
+
+def test_deadline_bounds_trickling_body(trickle_server):
+    """Test a body which keeps arriving is cut off at the deadline."""
+    league = League(requests.Session())
+    started = time.monotonic()
+    with deadline(0.5), pytest.raises(DeadlineExceededException):
+        league.follow_link(requests.Request("GET", trickle_server))
+    assert time.monotonic() - started < 1.0
+
+
+def test_trickling_body_within_deadline(trickle_server):
+    """Test a slow body which arrives within the deadline is returned whole."""
+    league = League(requests.Session())
+    with deadline(10.0):
+        response = league.follow_link(requests.Request("GET", trickle_server))
+    assert response.json() == {"sessions": []}
@@ -0,0 +1,209 @@
+"""Test directory module."""
+import random
+from urllib.parse import parse_qs, urlsplit
+from iracing_client.data.cache import SharedCache
+from iracing_client.data.directory import LeagueDirectoryIndex
+from iracing_client.data.league import League, LeagueOrder, LeagueSort, DIRECTORY_URL
+
+
+def _league(league_id, name, owner, roster_count, tags=(), **fields):
+    """Return a league directory entry."""
+    return {
+        "league_id": league_id,
+        "league_name": name,
+        "owner": {"display_name": owner},
+        "roster_count": roster_count,
+        "tags": {
+            "not_categorized": [
+                {"tag_id": i, "tag_name": t} for i, t in enumerate(tags)
+            ]
+        },
+        **fields,
+    }
+
+
+LEAGUES = [
+    _league(
+        1, "Endurance Masters", "Ann Driver", 50, ["gt3", "endurance"], recruiting=True
+    ),
+    _league(2, "Sprint Cup", "Bob Racer", 12, ["oval"]),
+    _league(3, "Endurance", "Cat Endurant", 30, ["endurance"]),
+    _league(4, "Friday Fun", "Dan Endurance", 5, ["gt3"], recruiting=True),
+]
+
+
+def _directory(leagues):
+    """Return a payload callable serving leagues a page at a time."""
+
+    def payload(url):
+        query = parse_qs(urlsplit(url).query)
+        lowerbound = int(query.get("lowerbound", ["0"])[0])
+        upperbound = int(query["upperbound"][0])
+        return {"results_page": leagues[lowerbound : upperbound + 1]}
+
+    return payload
+
+
+def test_directory_search(fake_session):
+    """Test searches filter and order like get_directory."""
+    fake_session.add(DIRECTORY_URL, _directory(LEAGUES))
+    index = LeagueDirectoryIndex(League(fake_session), page_size=3)
+    assert index.refresh() == {"added": 4, "changed": 0, "removed": 0}
+    assert len(fake_session.sent) == 6  # Three pages, the last empty, each two hops.
+
+    def ids(**query):
+        return [entry["league_id"] for entry in index.search(**query)]
+
+    assert ids(search="endur") == [3, 1, 4]
+    assert ids(search="en") == [3, 1, 4]
+    assert ids(search="zzz") == []
+    assert ids(tag="GT3, endurance") == [1]
+    assert ids(restrict_to_recruiting=True, sort=LeagueSort.LEAGUENAME) == [1, 4]
+    assert ids(minimum_roster_count=12, maximum_roster_count=30) == [3, 2]
+    assert ids(sort=LeagueSort.ROSTERCOUNT, order=LeagueOrder.DESC) == [1, 3, 2, 4]
+    assert ids(sort=LeagueSort.DISPLAYNAME, lowerbound=1, upperbound=2) == [2, 3]
+    assert ids(search="endur", sort=LeagueSort.ROSTERCOUNT) == [4, 3, 1]
+
+
+def test_directory_refresh_is_incremental(fake_session):
+    """Test refresh re-indexes only added, changed and removed leagues."""
+    leagues = list(LEAGUES)
+    fake_session.add(DIRECTORY_URL, lambda url: _directory(leagues)(url))
+    index = LeagueDirectoryIndex(League(fake_session))
+    index.refresh()
+    assert index.refresh() == {"added": 0, "changed": 0, "removed": 0}
+
+    leagues = [
+        _league(1, "Sprint Masters", "Ann Driver", 50),
+        LEAGUES[1],
+        LEAGUES[2],
+        _league(5, "Endurance Club", "Eve Pilot", 8),
+    ]
+    assert index.refresh() == {"added": 1, "changed": 1, "removed": 1}
+    assert index.get(4) is None
+    assert [entry["league_id"] for entry in index.search(search="endurance")] == [3, 5]
+    assert [entry["league_id"] for entry in index.search(tag="gt3")] == []
+
+
+def test_directory_crawl_bypasses_shared_cache(fake_session, tmp_path):
+    """Test refresh sees changes even when pages are in the shared cache."""
+    leagues = list(LEAGUES)
+    fake_session.add(DIRECTORY_URL, lambda url: _directory(leagues)(url))
+    league = League(fake_session, cache=SharedCache("driver@example.com", tmp_path))
+    index = LeagueDirectoryIndex(league)
+    index.refresh()
+    leagues = LEAGUES[:3]
+    assert index.refresh() == {"added": 0, "changed": 0, "removed": 1}
+
+
+def test_empty_directory_search(fake_session):
+    """Test an index with nothing in it finds nothing."""
+    index = LeagueDirectoryIndex(League(fake_session))
+    assert not index.search(tag="gt3", sort=LeagueSort.LEAGUENAME)
+    index.refresh(entries=[])
+    assert not index.search(search="abc", sort=LeagueSort.ROSTERCOUNT)
+
+
+def test_directory_crawl_with_short_one_based_pages(fake_session):
+    """Test the crawl reaches the end when pages are capped and rows start at 1."""
+
+    def payload(url):
+        query = parse_qs(urlsplit(url).query)
+        lowerbound = max(int(query.get("lowerbound", ["1"])[0]), 1)
+        upperbound = min(int(query["upperbound"][0]), lowerbound + 1)
+        return {"results_page": LEAGUES[lowerbound - 1 : upperbound]}
+
+    fake_session.add(DIRECTORY_URL, payload)
+    index = LeagueDirectoryIndex(League(fake_session), page_size=40)
+    assert [entry["league_id"] for entry in index.crawl()] == [1, 2, 3, 4]
+
+
+def _reference_search(leagues, **query):
+    """Search leagues by brute force, for comparison with the index."""
+    search = (query.get("search") or "").lower()
+    tags = [t.strip() for t in (query.get("tag") or "").lower().split(",") if t]
+    minimum = query.get("minimum_roster_count") or 0
+    maximum = query.get("maximum_roster_count") or float("inf")
+
+    def names(league):
+        return league["league_name"].lower(), league["owner"]["display_name"].lower()
+
+    def matches(league):
+        league_tags = [t["tag_name"] for t in league["tags"]["not_categorized"]]
+        return (
+            any(search in name for name in names(league))
+            and all(t in league_tags for t in tags)
+            and minimum <= league["roster_count"] <= maximum
+            and (not query.get("restrict_to_recruiting") or league.get("recruiting"))
+        )
+
+    def key(league):
+        league_name, owner_name = names(league)
+        sort = query.get("sort", LeagueSort.RELEVANCE)
+        if sort == LeagueSort.RELEVANCE:
+            hits = [
+                league_name == search,
+                league_name.startswith(search),
+                search in league_name,
+                owner_name.startswith(search),
+                True,
+            ]
+            return (hits.index(True), league_name, league["league_id"])
+        value = {
+            LeagueSort.LEAGUENAME: league_name,
+            LeagueSort.DISPLAYNAME: owner_name,
+            LeagueSort.ROSTERCOUNT: league["roster_count"],
+        }[sort]
+        return (value, league["league_id"])
+
+    ordered = sorted(
+        (league for league in leagues if matches(league)),
+        key=key,
+        reverse=query.get("order") == LeagueOrder.DESC,
+    )
+    lowerbound = query.get("lowerbound") or 0
+    upperbound = query.get("upperbound", lowerbound + 39)
+    return [league["league_id"] for league in ordered[lowerbound : upperbound + 1]]
+
+
+def test_directory_search_matches_brute_force():
+    """Test every search path agrees with a brute force search across refreshes."""
+    rng = random.Random(7)
+    words = ["endurance", "sprint", "gt", "oval", "masters", "cup", "fun", "a"]
+
+    def league(league_id):
+        return _league(
+            league_id,
+            " ".join(rng.sample(words, 2)),
+            rng.choice(words).title() + " Driver",
+            rng.randrange(60),
+            rng.sample(["gt3", "oval", "endurance"], rng.randrange(3)),
+            recruiting=rng.random() < 0.3,
+        )
+
+    leagues = {league_id: league(league_id) for league_id in range(300)}
+    index = LeagueDirectoryIndex(None)
+    index.refresh(entries=list(leagues.values()))
+    for _ in range(3):
+        for league_id in rng.sample(sorted(leagues), 30):
+            del leagues[league_id]
+        for league_id in rng.sample(range(300, 400), 20):
+            leagues[league_id] = league(league_id)
+        for league_id in rng.sample(sorted(leagues), 30):
+            leagues[league_id] = league(league_id)
+        index.refresh(entries=list(leagues.values()))
+        for _ in range(200):
+            query = {
+                "search": rng.choice([None, "e", "sp", "gt ", "endur", "xyz"]),
+                "tag": rng.choice([None, "gt3", "oval,endurance"]),
+                "restrict_to_recruiting": rng.random() < 0.2,
+                "minimum_roster_count": rng.choice([None, 10, 40]),
+                "maximum_roster_count": rng.choice([None, 20, 50]),
+                "lowerbound": rng.choice([None, 0, 5, 100]),
+                "sort": rng.choice(list(LeagueSort)),
+                "order": rng.choice(list(LeagueOrder)),
+            }
+            if rng.random() < 0.5:
+                query["upperbound"] = (query["lowerbound"] or 0) + rng.randrange(80)
+            found = [entry["league_id"] for entry in index.search(**query)]
+            assert found == _reference_search(leagues.values(), **query), query
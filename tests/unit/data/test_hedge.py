@@ -0,0 +1,88 @@
+"""Test hedge module."""
+import itertools
+import threading
+import time
+import requests
+from iracing_client.data.hedge import HedgePolicy
+
+
+def test_no_hedge_without_samples():
+    """Test requests are not hedged until latencies are known."""
+    hedge = HedgePolicy(min_samples=5)
+    assert hedge.send(lambda: "response") == "response"
+    assert hedge.delay() is None
+    assert hedge.fired == 0
+
+
+def test_hedge_wins_over_slow_request():
+    """Test a slow request is hedged and the faster response is used."""
+    hedge = HedgePolicy(percentile=0.5, max_ratio=1.0, min_samples=3)
+    for _ in range(3):
+        hedge.send(lambda: "fast")
+    calls = itertools.count()
+
+    def execute():
+        if next(calls) == 0:
+            time.sleep(0.5)
+            return "slow"
+        return "hedged"
+
+    assert hedge.send(execute) == "hedged"
+    assert hedge.fired == 1
+    assert hedge.won == 1
+    hedge.shutdown()
+
+
+def test_hedge_budget():
+    """Test no more than max_ratio of requests are hedged."""
+    hedge = HedgePolicy(percentile=0.5, max_ratio=0.0, min_samples=1)
+    hedge.send(lambda: "fast")
+
+    def execute():
+        time.sleep(0.05)
+        return "slow"
+
+    assert hedge.send(execute) == "slow"
+    assert hedge.fired == 0
+    hedge.shutdown()
+
+
+def test_pool_does_not_limit_concurrency():
+    """Test first attempts are not queued behind the backup worker pool."""
+    hedge = HedgePolicy(max_ratio=1.0, min_samples=1, max_workers=1)
+    hedge.send(lambda: time.sleep(0.3))
+
+    def execute():
+        time.sleep(0.1)
+        return "response"
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=hedge.send, args=(execute,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - started < 0.25
+    assert hedge.fired == 0
+    hedge.shutdown()
+
+
+def test_error_response_does_not_win():
+    """Test a backup answering with a server error loses to a slower success."""
+    hedge = HedgePolicy(percentile=0.5, max_ratio=1.0, min_samples=1)
+    hedge.send(lambda: "fast")
+    calls = itertools.count()
+
+    def execute():
+        response = requests.Response()
+        if next(calls) == 0:
+            time.sleep(0.2)
+            response.status_code = 200
+        else:
+            response.status_code = 503
+        return response
+
+    assert hedge.send(execute).status_code == 200
+    assert hedge.fired == 1
+    assert hedge.won == 0
+    hedge.shutdown()
@@ -0,0 +1,53 @@
+"""Test memoization of data object methods."""
+from iracing_client.data.cache import MemoCache
+from iracing_client.data.league import League, LEAGUE_URL, SEASONS_URL
+from iracing_client.data.member import Member, PROFILE_URL
+
+
+def test_memo_cache_lru():
+    """Test the least recently used entry is evicted."""
+    cache = MemoCache(maxsize=2)
+    cache.put({"league_id": 1}, "one")
+    cache.put({"league_id": 2}, "two")
+    assert cache.get({"league_id": 1}) == "one"
+    cache.put({"league_id": 3}, "three")
+    assert cache.get({"league_id": 2}) is None
+    assert cache.get({"league_id": 1}) == "one"
+    assert len(cache) == 2
+
+
+def test_memo_cache_ttl():
+    """Test expired entries are not returned."""
+    cache = MemoCache(ttl=-1)
+    cache.put({}, "stale")
+    assert cache.get({}) is None
+
+
+def test_league_memoized(fake_session):
+    """Test memoized methods send one request per distinct params."""
+    fake_session.add(LEAGUE_URL, lambda url: {"url": url})
+    fake_session.add(SEASONS_URL, lambda url: {"url": url})
+    league = League(fake_session, memoize={"get_league": MemoCache()})
+    first = league.get_league(league_id=3580)
+    assert league.get_league(league_id=3580) is first
+    assert league.get_league(league_id=3580, include_licenses=True) is not first
+    assert len(fake_session.sent) == 4
+
+    league.get_seasons(league_id=3580)
+    league.get_seasons(league_id=3580)
+    assert len(fake_session.sent) == 8
+
+
+def test_selective_invalidation(fake_session):
+    """Test invalidating one call keeps the others."""
+    fake_session.add(PROFILE_URL, lambda url: {"url": url})
+    member = Member(fake_session, memoize={"get_profile": MemoCache()})
+    member.get_profile(cust_id=1)
+    member.get_profile(cust_id=2)
+    member.invalidate("get_profile", {"cust_id": 1})
+    member.get_profile(cust_id=1)
+    member.get_profile(cust_id=2)
+    assert len(fake_session.sent) == 6
+    member.clear_cache()
+    member.get_profile(cust_id=2)
+    assert len(fake_session.sent) == 8
@@ -0,0 +1,54 @@
+"""Test scheduler module."""
+import threading
+import time
+import pytest
+import requests
+from iracing_client.data.scheduler import BACKGROUND, INTERACTIVE, RequestScheduler
+
+
+def _wait_for(condition):
+    """Poll until condition() is true."""
+    deadline = time.monotonic() + 2
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_interactive_jumps_the_queue():
+    """Test an interactive request is granted ahead of queued background ones."""
+    scheduler = RequestScheduler(rate=10, burst=1)
+    scheduler.acquire(BACKGROUND)
+    order = []
+
+    def request(lane):
+        scheduler.acquire(lane)
+        order.append(lane)
+
+    threads = [threading.Thread(target=request, args=(BACKGROUND,)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: scheduler.waiting(BACKGROUND) + len(order) == 3)
+    threads.append(threading.Thread(target=request, args=(INTERACTIVE,)))
+    threads[-1].start()
+    for thread in threads:
+        thread.join()
+    assert order.index(INTERACTIVE) <= 1
+    assert scheduler.granted == {INTERACTIVE: 1, BACKGROUND: 4}
+
+
+def test_unknown_lane():
+    """Test an unknown lane is rejected."""
+    with pytest.raises(ValueError):
+        RequestScheduler().acquire("bulk")
+
+
+def test_rate_limit_headers_pause():
+    """Test a spent rate limit holds all lanes until the reset time."""
+    scheduler = RequestScheduler(rate=1000, burst=10)
+    response = requests.Response()
+    response.headers["x-ratelimit-remaining"] = "0"
+    response.headers["x-ratelimit-reset"] = str(time.time() + 0.2)
+    scheduler.update(response)
+    started = time.monotonic()
+    scheduler.acquire(INTERACTIVE)
+    assert time.monotonic() - started >= 0.1
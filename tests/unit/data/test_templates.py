@@ -0,0 +1,79 @@
+"""Test templates module."""
+import requests
+from requests.cookies import create_cookie
+from iracing_client.data.league import League, LEAGUE_URL, SEASON_STANDINGS_URL
+from iracing_client.data.templates import RequestTemplates
+
+
+def _session() -> requests.Session:
+    """Return a session holding an iRacing auth cookie."""
+    http_session = requests.Session()
+    http_session.cookies.set_cookie(
+        create_cookie("authtoken_members", "one", domain=".iracing.com")
+    )
+    return http_session
+
+
+def test_template_matches_prepare_request():
+    """Test templated requests match those prepared by the session."""
+    http_session = _session()
+    templates = RequestTemplates(http_session)
+    request = requests.Request(
+        "GET",
+        SEASON_STANDINGS_URL,
+        params={"league_id": 3580, "season_id": 93206, "car_id": None, "x": True},
+    )
+    fast = templates.prepare(request)
+    slow = http_session.prepare_request(request)
+    assert fast.url == slow.url
+    assert dict(fast.headers) == dict(slow.headers)
+
+
+def test_template_follows_cookie_changes():
+    """Test the Cookie header is rebuilt when the session's cookies change."""
+    http_session = _session()
+    templates = RequestTemplates(http_session)
+    request = requests.Request("GET", LEAGUE_URL, params={"league_id": 1})
+    assert templates.prepare(request).headers["Cookie"] == "authtoken_members=one"
+    http_session.cookies.set_cookie(
+        create_cookie("authtoken_members", "two", domain=".iracing.com")
+    )
+    assert templates.prepare(request).headers["Cookie"] == "authtoken_members=two"
+
+
+def test_link_uses_url_as_given():
+    """Test a complete link url is used verbatim and gets no iRacing cookies."""
+    templates = RequestTemplates(_session())
+    link = "https://s3.example.com/data/abc.json?X-Amz-Signature=a%2Fb"
+    prepared = templates.prepare(requests.Request("GET", link))
+    assert prepared.url == link
+    assert "Cookie" not in prepared.headers
+
+
+def test_customized_request_not_templated():
+    """Test requests with their own settings use the regular path."""
+    templates = RequestTemplates(_session())
+    request = requests.Request("GET", LEAGUE_URL, headers={"X-Test": "1"})
+    assert templates.prepare(request) is None
+
+
+def test_fast_prepare(fake_session):
+    """Test a data object prepares both hops from templates."""
+    fake_session.add(LEAGUE_URL, lambda url: {"url": url})
+    league = League(fake_session, fast_prepare=True)
+    assert league.get_league(league_id=3580)["url"].endswith("?league_id=3580")
+
+
+def test_session_params_and_header_changes():
+    """Test session params use the regular path and header changes are seen."""
+    http_session = _session()
+    templates = RequestTemplates(http_session)
+    request = requests.Request("GET", LEAGUE_URL, params={"league_id": 1})
+    assert templates.prepare(request).headers["User-Agent"].startswith("python")
+
+    http_session.headers["User-Agent"] = "iracing-client"
+    assert templates.prepare(request).headers["User-Agent"] == "iracing-client"
+
+    http_session.params = {"x": 1}
+    assert templates.prepare(request) is None
+    assert http_session.prepare_request(request).url == LEAGUE_URL + "?x=1&league_id=1"
@@ -0,0 +1,70 @@
+"""Test transfer module."""
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+import requests
+from iracing_client.data.league import League, LEAGUE_URL
+from iracing_client.data.transfer import ACCEPT_ENCODING, TransferStats
+
+PAYLOAD = b'{"sessions": []}' * 1000
+
+
+class GzipHandler(BaseHTTPRequestHandler):
+    """Serves PAYLOAD gzip compressed, echoing the Accept-Encoding it received."""
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Serve the payload."""
+        body = gzip.compress(PAYLOAD)
+        self.send_response(200)
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Accept-Encoding", self.headers["Accept-Encoding"])
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Keep the test output quiet."""
+
+
+@pytest.fixture
+def gzip_server():
+    """Return the url of a local server sending gzip compressed payloads."""
+    server = HTTPServer(("127.0.0.1", 0), GzipHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/payload.json"
+    server.shutdown()
+
+
+def test_wire_and_decoded_bytes(gzip_server):
+    """Test compressed bytes on the wire and decoded bytes are both counted."""
+    stats = TransferStats()
+    response = requests.get(gzip_server, timeout=5)
+    assert response.content == PAYLOAD
+    stats.record("league/get", "link", response)
+    counts = stats.snapshot()["league/get"]["link"]
+    assert counts["decoded_bytes"] == len(PAYLOAD)
+    assert counts["wire_bytes"] == len(gzip.compress(PAYLOAD))
+    assert counts["encodings"] == {"gzip": 1}
+
+
+def test_data_object_counts_both_hops(fake_session):
+    """Test a data object counts the data hop and the link hop per endpoint."""
+    fake_session.add(LEAGUE_URL, {"league_id": 1})
+    stats = TransferStats()
+    League(fake_session, transfer_stats=stats).get_league(league_id=1)
+    hops = stats.snapshot()["league/get"]
+    assert hops["data"]["requests"] == hops["link"]["requests"] == 1
+    assert hops["link"]["decoded_bytes"] == len(b'{"league_id": 1}')
+    stats.reset()
+    assert not stats.snapshot()
+
+
+def test_best_encoding_negotiated(gzip_server):
+    """Test data objects advertise every encoding urllib3 can decode."""
+    league = League(requests.Session())
+    request = league.prepare_request(requests.Request("GET", gzip_server))
+    response = league.execute(request)
+    assert response.headers["X-Accept-Encoding"] == ACCEPT_ENCODING
+    assert "gzip" in ACCEPT_ENCODING
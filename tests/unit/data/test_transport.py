@@ -0,0 +1,52 @@
+"""Test transport module."""
+import pytest
+import requests
+from iracing_client.data.league import League, LEAGUE_URL
+from iracing_client.data.transport import (
+    RecordingTransport,
+    ReplayMissException,
+    ReplayTransport,
+)
+
+
+def test_record_and_replay(fake_session, tmp_path):
+    """Test both hops of a request are recorded and replayed offline."""
+    archive = tmp_path / "league.archive"
+    fake_session.add(LEAGUE_URL, lambda url: {"url": url})
+    recorder = RecordingTransport(fake_session, archive)
+    recorded = League(fake_session, transport=recorder).get_league(league_id=3580)
+    recorder.close()
+    assert len(fake_session.sent) == 2
+
+    replay = ReplayTransport(archive)
+    assert len(replay) == 2
+    league = League(requests.Session(), transport=replay)
+    assert league.get_league(league_id=3580) == recorded
+    with pytest.raises(ReplayMissException):
+        league.get_league(league_id=1)
+    replay.close()
+
+
+def test_replay_empty_archive(tmp_path):
+    """Test an empty archive replays nothing."""
+    archive = tmp_path / "empty.archive"
+    archive.touch()
+    assert len(ReplayTransport(archive)) == 0
+
+
+def test_record_streamed_download(fake_session, tmp_path):
+    """Test a streamed download is recorded, without the cookie values."""
+    archive = tmp_path / "league.archive"
+    fake_session.add(LEAGUE_URL, {"league_id": 3580})
+    recorder = RecordingTransport(fake_session, archive)
+    league = League(fake_session, transport=recorder)
+    request = requests.Request("GET", LEAGUE_URL, params={"league_id": 3580})
+    league.send_to_file(request, tmp_path / "recorded.json")
+    recorder.close()
+    recorded = archive.read_bytes()
+    assert b'"authtoken_members": "redacted"' in recorded
+    assert b'"token"' not in recorded
+
+    league = League(requests.Session(), transport=ReplayTransport(archive))
+    replayed = league.send_to_file(request, tmp_path / "replayed.json")
+    assert replayed.read_bytes() == (tmp_path / "recorded.json").read_bytes()
@@ -0,0 +1,99 @@
+"""Test watch module."""
+import logging
+import threading
+from iracing_client.data.cache import SharedCache
+from iracing_client.data.league import League, SEASON_SESSIONS_URL
+from tests.unit.conftest import LINK_HOST
+
+
+def test_watch_season_sessions(fake_session):
+    """Test only added, removed and changed sessions are reported."""
+    sessions = [
+        {"private_session_id": 1, "status": "open"},
+        {"private_session_id": 2, "status": "open"},
+    ]
+    fake_session.add(SEASON_SESSIONS_URL, lambda url: {"sessions": sessions})
+    watch = League(fake_session).watch_season_sessions(
+        league_id=3580, season_id=93206, min_interval=1, max_interval=8
+    )
+    received = []
+    watch.subscribe(received.append)
+
+    first = watch.poll()
+    assert len(first.added) == 2
+    assert watch.interval == 1
+
+    assert not watch.poll()
+    assert not watch.poll()
+    assert watch.interval == 4
+    assert len(received) == 1
+
+    sessions = [
+        {"private_session_id": 2, "status": "running"},
+        {"private_session_id": 3, "status": "open"},
+    ]
+    changes = watch.poll()
+    assert [s["private_session_id"] for s in changes.added] == [3]
+    assert [s["private_session_id"] for s in changes.removed] == [1]
+    assert [s["private_session_id"] for s in changes.changed] == [2]
+    assert watch.interval == 1
+    assert len(received) == 2
+
+
+def test_watch_run_stops(fake_session):
+    """Test run polls until stop is set."""
+    fake_session.add(SEASON_SESSIONS_URL, {"sessions": [{"private_session_id": 1}]})
+    watch = League(fake_session).watch_season_sessions(league_id=1, season_id=1)
+    stop = threading.Event()
+    watch.subscribe(lambda changes: stop.set())
+    watch.run(stop)
+    assert len(watch.sessions) == 1
+
+
+def test_watch_bypasses_shared_cache(fake_session, tmp_path):
+    """Test a shared cache does not hide changes from the watch."""
+    sessions = [{"private_session_id": 1}]
+    fake_session.add(SEASON_SESSIONS_URL, lambda url: {"sessions": sessions})
+    league = League(fake_session, cache=SharedCache("driver@example.com", tmp_path))
+    watch = league.watch_season_sessions(league_id=1, season_id=1)
+    watch.poll()
+    sessions = [{"private_session_id": 1}, {"private_session_id": 2}]
+    changes = watch.poll()
+    assert [s["private_session_id"] for s in changes.added] == [2]
+
+
+class GarblingTransport:  # pylint: disable=too-few-public-methods
+    """A transport which garbles the first linked payload."""
+
+    def __init__(self, http_session):
+        self.http_session = http_session
+        self.garbled = False
+
+    def send(self, request, **options):
+        """Send the request, replacing the first linked payload with HTML."""
+        response = self.http_session.send(request, **options)
+        if request.url.startswith(LINK_HOST) and not self.garbled:
+            self.garbled = True
+            response._content = b"<html>"  # pylint: disable=protected-access
+        return response
+
+
+def test_watch_survives_bad_payloads_and_subscribers(fake_session, caplog):
+    """Test undecodable payloads and failing subscribers do not stop the poller."""
+    fake_session.add(SEASON_SESSIONS_URL, {"sessions": [{"private_session_id": 1}]})
+    league = League(fake_session, transport=GarblingTransport(fake_session))
+    watch = league.watch_season_sessions(
+        league_id=1, season_id=1, min_interval=0.01, max_interval=0.01
+    )
+    stop = threading.Event()
+
+    def failing(changes):
+        raise RuntimeError(f"cannot handle {changes}")
+
+    watch.subscribe(failing)
+    watch.subscribe(lambda changes: stop.set())
+    with caplog.at_level(logging.WARNING):
+        watch.run(stop)
+    assert len(watch.sessions) == 1
+    assert "poll failed: JSONDecodeError" in caplog.text
+    assert "subscriber" in caplog.text
@@ -0,0 +1,104 @@
+"""Test cli module."""
+import gc
+import gzip
+import io
+import json
+import warnings
+from iracing_client import cli
+from iracing_client.data.league import (
+    LEAGUE_URL,
+    SEASONS_URL,
+    SEASON_SESSIONS_URL,
+    SEASON_STANDINGS_URL,
+)
+from iracing_client.data.member import MEMBER_URL
+from tests.unit.conftest import LINK_HOST
+
+
+def test_export(fake_session):
+    """Test every requested payload is written as one NDJSON line."""
+    for url in (LEAGUE_URL, SEASONS_URL, SEASON_SESSIONS_URL, SEASON_STANDINGS_URL):
+        fake_session.add(url, {"success": True})
+    fake_session.add(MEMBER_URL, {"members": []})
+    args = cli.build_parser().parse_args(
+        [
+            "export",
+            "--cust-ids",
+            "1,2,3",
+            "--league-ids",
+            "3580",
+            "--seasons",
+            "3580:93206,3580:1",
+            "--parallelism",
+            "2",
+        ]
+    )
+    output = io.StringIO()
+    summary = cli.export(args, fake_session, output)
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(records) == summary["records"] == 9
+    assert summary["errors"] == 0
+    assert summary["bytes"] == len(output.getvalue())
+    kinds = sorted(record["kind"] for record in records)
+    assert kinds.count("member") == 3
+    assert kinds.count("standings") == kinds.count("sessions") == 2
+
+
+def test_export_errors(fake_session):
+    """Test failed fetches are written as error records."""
+    args = cli.build_parser().parse_args(["export", "--league-ids", "1"])
+    output = io.StringIO()
+    summary = cli.export(args, fake_session, output)
+    assert summary["errors"] == 2
+    assert all("error" in json.loads(line) for line in output.getvalue().splitlines())
+
+
+def test_export_survives_bad_payload(fake_session):
+    """Test a payload which is not JSON is recorded as an error, not fatal."""
+    fake_session.add(LEAGUE_URL, lambda url: {"league": url})
+    fake_session.add(SEASONS_URL, {"seasons": []})
+    send = fake_session.send
+
+    def send_with_bad_payload(request, **kwargs):
+        response = send(request, **kwargs)
+        if request.url.startswith(LINK_HOST) and "league_id=2" in request.url:
+            response._content = b"<html>Bad gateway</html>"  # pylint: disable=protected-access
+        return response
+
+    fake_session.send = send_with_bad_payload
+    args = cli.build_parser().parse_args(["export", "--league-ids", "1,2,3"])
+    output = io.StringIO()
+    summary = cli.export(args, fake_session, output)
+    assert summary["records"] == 4
+    assert summary["errors"] == 2
+    assert len(output.getvalue().splitlines()) == 6
+
+
+def test_latency_sample_is_bounded(monkeypatch):
+    """Test the writer keeps a bounded sample of latencies."""
+    monkeypatch.setattr(cli, "LATENCY_SAMPLES", 10)
+    writer = cli.ExportWriter(io.StringIO())
+    for latency in range(100):
+        writer.write("member", {}, (float(latency), {}, None))
+    assert len(writer.latencies) == 10
+    assert writer.summary()["max"] == 99.0
+
+
+def test_gzip_output_file(tmp_path):
+    """Test a .gz output is closed, trailer included, when its wrapper is closed."""
+    path = tmp_path / "export.ndjson.gz"
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        output = cli._open_output(str(path), None)  # pylint: disable=protected-access
+        output.write('{"kind":"member"}\n')
+        output.close()
+        gc.collect()
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+    with gzip.open(path, "rt", encoding="utf-8") as export_file:
+        assert export_file.read() == '{"kind":"member"}\n'
+
+
+def test_main_requires_credentials(monkeypatch):
+    """Test the command refuses to run without credentials."""
+    monkeypatch.delenv("IRACING_USERNAME", raising=False)
+    assert cli.main(["export", "--cust-ids", "1"]) == 2